@@ -1,11 +1,24 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-from pydantic import BaseModel
-from x_analyzer import XAnalyzer
-import pandas as pd
+from fastapi.responses import Response, StreamingResponse
+from typing import TYPE_CHECKING, List, Optional
+from pydantic import BaseModel, Field
+from criteria import EAST_AFRICAN_LOCATIONS, INFLUENCER_CATEGORIES
+from results_store import ResultsStore
+from leaderboard_views import LeaderboardViews
+from metrics import REGISTRY
+from serialization import compress, dumps, frame_records, will_compress
 from datetime import datetime
+import asyncio
+import json
 import os
+import threading
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from jobs import JobManager
+    from x_analyzer import XAnalyzer
 
 app = FastAPI(title="X-EA Awards API")
 
@@ -18,8 +31,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize XAnalyzer
-analyzer = XAnalyzer()
+RESULTS_DIR = 'results'
+
+# The analyzer (with its API client, pandas, tweepy and the ranking model) is
+# only built by the first search, so importing the app and every reload stays
+# cheap for workers that serve listings and leaderboards
+_analyzer = None
+_jobs = None
+_results_store = None
+_leaderboard_views = None
+_results_snapshot = None
+_init_lock = threading.RLock()
+
+def get_results_store() -> ResultsStore:
+    global _results_store
+    with _init_lock:
+        if _results_store is None:
+            _results_store = ResultsStore(os.path.join(RESULTS_DIR, 'results.db'))
+        return _results_store
+
+def get_leaderboard_views() -> LeaderboardViews:
+    """Leaderboards kept in memory and refreshed whenever results are saved."""
+    global _leaderboard_views
+    with _init_lock:
+        if _leaderboard_views is None:
+            _leaderboard_views = LeaderboardViews(get_results_store(), snapshot=get_results_snapshot())
+        return _leaderboard_views
+
+def get_results_snapshot():
+    """Arrow snapshot of saved results that every worker memory-maps, or None without pyarrow."""
+    global _results_snapshot
+    with _init_lock:
+        if _results_snapshot is None:
+            from results_snapshot import ResultsSnapshot, snapshot_available
+            if not snapshot_available():
+                return None
+            _results_snapshot = ResultsSnapshot(os.path.join(RESULTS_DIR, 'accounts.arrow'))
+        return _results_snapshot
+
+def get_parquet_store():
+    """Partitioned Parquet dataset of saved results, or None without pyarrow."""
+    from parquet_store import ParquetStore, parquet_available
+    if not parquet_available():
+        return None
+    return ParquetStore(os.path.join(RESULTS_DIR, 'parquet'))
+
+def get_analyzer() -> 'XAnalyzer':
+    global _analyzer
+    with _init_lock:
+        if _analyzer is None:
+            from x_analyzer import XAnalyzer
+            _analyzer = XAnalyzer(results_dir=RESULTS_DIR, results_store=get_results_store())
+        return _analyzer
+
+def get_jobs() -> 'JobManager':
+    """Background worker pool for topic searches."""
+    global _jobs
+    with _init_lock:
+        if _jobs is None:
+            from jobs import JobManager
+            _jobs = JobManager(get_analyzer())
+        return _jobs
 
 # Pydantic models for request/response
 class AccountBase(BaseModel):
@@ -30,16 +102,39 @@ class AccountBase(BaseModel):
     followers_count: int
     annual_posts: int
     thread_count: int
+    activity_days: int  # Under 365 when the counts are lower bounds from a scan stopped early
     category: str
     verified: bool
     engagement_score: float
     intensity_score: float
     ai_rank: float
 
+# Field types the search endpoints validate result frames against, column by column
+ACCOUNT_SCHEMA = {name: field.annotation for name, field in AccountBase.model_fields.items()}
+
 class SearchResponse(BaseModel):
     accounts: List[AccountBase]
     total_count: int
 
+class SearchJobRequest(BaseModel):
+    topic: str
+    max_pages: int = 25
+    stream_top_n: Optional[int] = Field(None, ge=1)  # Keep the top N per category, saving chunks as they stream
+
+class BatchJobRequest(BaseModel):
+    topics: List[str]
+    max_pages: int = 25
+    stream_top_n: Optional[int] = Field(None, ge=1)
+
+class SearchJobStatus(BaseModel):
+    job_id: str
+    topic: str
+    topics: Optional[List[str]] = None
+    status: str
+    progress: dict
+    error: Optional[str] = None
+    total_count: int
+
 class DashboardStats(BaseModel):
     total_influencers: int
     average_engagement: float
@@ -51,8 +146,62 @@ class DashboardStats(BaseModel):
 async def root():
     return {"message": "X-EA Awards API is running"}
 
+def json_response(body: bytes, request: Optional[Request] = None, headers: Optional[dict] = None) -> Response:
+    """Already serialized JSON, gzipped for clients that accept it"""
+    accept_encoding = request.headers.get("accept-encoding") if request is not None else None
+    body, encoding_headers = compress(body, accept_encoding)
+    return Response(content=body, media_type="application/json", headers={**(headers or {}), **encoding_headers})
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header (a list of tags, or *) covers this ETag"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+    return "*" in tags or etag in tags
+
+def filter_accounts(
+    df: 'pd.DataFrame',
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    min_followers: Optional[int] = None,
+    min_engagement: Optional[float] = None,
+    sort_by: str = "ai_rank",
+    page: int = 1,
+    limit: int = 10,
+    request: Optional[Request] = None
+) -> Response:
+    """Filter, sort and paginate a ranked results frame into a SearchResponse body."""
+    if df is None or df.empty:
+        return json_response(dumps({"accounts": [], "total_count": 0}), request)
+    
+    # Apply filters
+    if country and country != "all":
+        df = df[df["country"].str.lower() == country.lower()]
+    if category and category != "all":
+        df = df[df["category"].str.lower() == category.lower()]
+    if min_followers:
+        df = df[df["followers_count"] >= min_followers]
+    if min_engagement:
+        df = df[df["engagement_score"] >= min_engagement]
+        
+    # Sort results
+    if sort_by in df.columns:
+        df = df.sort_values(sort_by, ascending=False)
+        
+    # Pagination
+    total_count = len(df)
+    start_idx = (page - 1) * limit
+    end_idx = start_idx + limit
+    df_page = df.iloc[start_idx:end_idx]
+    
+    # Validated and converted a column at a time instead of one AccountBase per row
+    accounts = frame_records(df_page, ACCOUNT_SCHEMA)
+    return json_response(dumps({"accounts": accounts, "total_count": total_count}), request)
+
 @app.get("/search", response_model=SearchResponse)
 async def search_accounts(
+    request: Request,
     topic: str,
     country: Optional[str] = None,
     category: Optional[str] = None,
@@ -60,108 +209,165 @@ async def search_accounts(
     min_engagement: Optional[float] = None,
     sort_by: str = "ai_rank",
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    refresh: bool = False
 ):
     try:
-        # Get accounts from analyzer
-        df = analyzer.analyze_accounts(topic)
+        # Serve filters and pages from the cached ranking when the topic was analyzed recently
+        df = None if refresh else get_jobs().cached_result(topic)
         
-        if df.empty:
-            return SearchResponse(accounts=[], total_count=0)
+        if df is None:
+            # Run the analysis on the worker pool so the event loop stays free
+            job = get_jobs().submit(topic, refresh=refresh)
+            df = await asyncio.wrap_future(job.future)
         
-        # Apply filters
-        if country and country != "all":
-            df = df[df["country"].str.lower() == country.lower()]
-        if category and category != "all":
-            df = df[df["category"].str.lower() == category.lower()]
-        if min_followers:
-            df = df[df["followers_count"] >= min_followers]
-        if min_engagement:
-            df = df[df["engagement_score"] >= min_engagement]
-            
-        # Sort results
-        if sort_by in df.columns:
-            df = df.sort_values(sort_by, ascending=False)
-            
-        # Pagination
-        total_count = len(df)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        df_page = df.iloc[start_idx:end_idx]
-        
-        # Convert to response model
-        accounts = []
-        for _, row in df_page.iterrows():
-            account = AccountBase(
-                username=row["username"],
-                name=row["name"],
-                location=row["location"],
-                country=row["country"],
-                followers_count=row["followers_count"],
-                annual_posts=row["annual_posts"],
-                thread_count=row["thread_count"],
-                category=row["category"],
-                verified=row["verified"],
-                engagement_score=float(row["engagement_score"]),
-                intensity_score=float(row["intensity_score"]),
-                ai_rank=float(row["ai_rank"])
-            )
-            accounts.append(account)
-            
-        return SearchResponse(accounts=accounts, total_count=total_count)
+        return filter_accounts(
+            df, country, category, min_followers, min_engagement, sort_by, page, limit, request
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/search/jobs", response_model=SearchJobStatus, status_code=202)
+async def create_search_job(request: SearchJobRequest):
+    """Start a background search, or join the one already running for this topic"""
+    job = get_jobs().submit(request.topic, max_pages=request.max_pages, stream_top_n=request.stream_top_n)
+    return SearchJobStatus(**job.to_dict())
+
+@app.post("/search/batch", response_model=SearchJobStatus, status_code=202)
+async def create_batch_job(request: BatchJobRequest):
+    """Analyze several topics together, enriching authors shared between them once"""
+    topics = [topic for topic in request.topics if topic.strip()]
+    if not topics:
+        raise HTTPException(status_code=400, detail="At least one topic is required")
+    job = get_jobs().submit_batch(topics, max_pages=request.max_pages, stream_top_n=request.stream_top_n)
+    return SearchJobStatus(**job.to_dict())
+
+@app.get("/search/jobs/{job_id}", response_model=SearchJobStatus)
+async def get_search_job(job_id: str):
+    """Poll the status and progress of a background search"""
+    job = get_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return SearchJobStatus(**job.to_dict())
+
+@app.get("/search/jobs/{job_id}/events")
+async def stream_search_job(job_id: str, request: Request):
+    """Stream progress and newly accepted accounts of a background search as Server-Sent Events"""
+    job = get_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+        
+    # Reconnecting EventSource clients resume after the last event they saw
+    last_id = int(request.headers.get("last-event-id", 0) or 0)
+    
+    async def event_stream():
+        nonlocal last_id
+        while True:
+            if await request.is_disconnected():
+                return
+                
+            events = await run_in_threadpool(job.events_since, last_id, 1.0)
+            if not events:
+                # Heartbeat with the live rate limit wait while the crawl is blocked
+                heartbeat = dict(job.progress, rate_limit_wait=round(get_analyzer().scheduler.max_wait_time(), 1))
+                yield f"event: progress\ndata: {json.dumps(heartbeat, default=str)}\n\n"
+                continue
+                
+            for event in events:
+                last_id = event["id"]
+                data = {key: value for key, value in event.items() if key not in ("id", "type")}
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(data, default=str)}\n\n"
+                if event["type"] == "done":
+                    return
+                    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/search/jobs/{job_id}/results", response_model=SearchResponse)
+async def get_search_job_results(
+    request: Request,
+    job_id: str,
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    min_followers: Optional[int] = None,
+    min_engagement: Optional[float] = None,
+    sort_by: str = "ai_rank",
+    page: int = 1,
+    limit: int = 10,
+    topic: Optional[str] = None
+):
+    """Fetch paginated results of a finished background search.
+    
+    Batch jobs return the combined leaderboard, or one topic's ranking with ?topic=
+    """
+    job = get_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+        
+    df = job.result
+    if topic is not None:
+        df = next((ranking for name, ranking in job.rankings.items() if name.lower() == topic.lower()), None)
+        if df is None:
+            raise HTTPException(status_code=404, detail=f"Topic '{topic}' is not part of this job")
+            
+    try:
+        return filter_accounts(
+            df, country, category, min_followers, min_engagement, sort_by, page, limit, request
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.on_event("startup")
+async def migrate_saved_results():
+    # One-shot import of CSV results saved before the results store existed
+    get_results_store().migrate_csv_dir(RESULTS_DIR)
+    
+    # Saves keep the shared snapshot current; rebuild it only when the store has changed since,
+    # so workers starting together skip it once the first has written it (writes replace the file atomically)
+    snapshot = get_results_snapshot()
+    if snapshot is not None and len(get_results_store()) and not snapshot.is_current(get_results_store()):
+        snapshot.write(get_results_store())
+    
+    # Precompute every category/sort leaderboard before the first request
+    get_leaderboard_views().build()
+
 @app.get("/leaderboard/{category}")
 async def get_leaderboard(
+    request: Request,
     category: str = "all",
     sort_by: str = "ai_rank",
     limit: int = 10
 ):
     try:
-        # Get all accounts from saved results or recent searches
-        results_dir = "results"
-        all_accounts = []
-        
-        # Combine results from recent files
-        for file in os.listdir(results_dir):
-            if file.endswith(".csv"):
-                df = pd.read_csv(os.path.join(results_dir, file))
-                all_accounts.append(df)
-                
-        if not all_accounts:
-            return []
-            
-        # Combine all results and remove duplicates
-        df = pd.concat(all_accounts).drop_duplicates(subset=["username"])
-        
-        # Apply category filter
-        if category != "all":
-            df = df[df["category"].str.lower() == category.lower()]
-            
-        # Sort and limit results
-        df = df.sort_values(sort_by, ascending=False).head(limit)
-        
-        # Convert to list of dicts for response
-        return df.to_dict("records")
+        # Served from the materialized views; unchanged boards answer repeat polls with 304
+        body, etag = get_leaderboard_views().get_json(category, sort_by, limit)
+        if will_compress(body, request.headers.get("accept-encoding")):
+            etag = etag[:-1] + '-gz"'  # The gzipped representation has different bytes, so its own tag
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return json_response(body, request, headers)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats():
     try:
-        # Get all accounts from saved results
-        results_dir = "results"
-        all_accounts = []
+        # Totals and distributions are maintained incrementally by the results store
+        stats = get_results_store().stats()
         
-        for file in os.listdir(results_dir):
-            if file.endswith(".csv"):
-                df = pd.read_csv(os.path.join(results_dir, file))
-                all_accounts.append(df)
-                
-        if not all_accounts:
+        if not stats["total_influencers"]:
             return DashboardStats(
                 total_influencers=0,
                 average_engagement=0.0,
@@ -169,41 +375,80 @@ async def get_dashboard_stats():
                 category_distribution={},
                 engagement_trends={}
             )
-            
-        # Combine all results and remove duplicates
-        df = pd.concat(all_accounts).drop_duplicates(subset=["username"])
-        
-        # Calculate statistics
-        total_influencers = len(df)
-        average_engagement = float(df["engagement_score"].mean())
-        active_countries = len(df["country"].unique())
         
-        # Category distribution
-        category_distribution = df["category"].value_counts().to_dict()
-        
-        # Engagement trends (last 6 months)
-        engagement_trends = {
-            "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-            "data": [4.2, 4.5, 4.8, 4.6, 4.9, 5.1]  # Sample data
-        }
+        # Engagement trends (last 6 months), read from the rollups kept at write time
+        engagement_trends = get_results_store().trends("month", limit=6)
         
         return DashboardStats(
-            total_influencers=total_influencers,
-            average_engagement=average_engagement,
-            active_countries=active_countries,
-            category_distribution=category_distribution,
+            total_influencers=stats["total_influencers"],
+            average_engagement=stats["average_engagement"],
+            active_countries=stats["active_countries"],
+            category_distribution=stats["category_distribution"],
             engagement_trends=engagement_trends
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/dashboard/trends")
+async def get_dashboard_trends(
+    period: str = "month",
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 12
+):
+    """Weekly or monthly engagement trend, overall or for one country or category"""
+    dimension, value = "all", "all"
+    if country and country != "all":
+        dimension, value = "country", country
+    elif category and category != "all":
+        dimension, value = "category", category
+        
+    try:
+        return get_results_store().trends(period, dimension, value, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/results/export")
+async def export_results(
+    country: Optional[str] = None,
+    category: Optional[str] = None,
+    topic: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    columns: Optional[str] = Query(None, description="Comma-separated columns to include")
+):
+    """Export saved results as CSV, reading only the requested columns and matching partitions"""
+    store = get_parquet_store()
+    if store is None:
+        raise HTTPException(status_code=501, detail="Exporting saved results requires pyarrow")
+        
+    try:
+        selected = [column.strip() for column in columns.split(",")] if columns else None
+        content = await run_in_threadpool(
+            store.export_csv, None, columns=selected, country=country, category=category,
+            topic=topic, date_from=date_from, date_to=date_to
+        )
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+        
+    return Response(
+        content=content,
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="results.csv"'}
+    )
+
 @app.get("/countries")
 async def get_countries():
     """Get list of supported East African countries"""
-    return list(analyzer.east_african_locations.keys())
+    return list(EAST_AFRICAN_LOCATIONS.keys())
 
 @app.get("/categories")
 async def get_categories():
     """Get list of influencer categories"""
-    return list(analyzer.categories.keys()) 
\ No newline at end of file
+    return list(INFLUENCER_CATEGORIES.keys()) 
+
+@app.get("/metrics")
+async def get_metrics():
+    """Analyzer counters and stage latencies in the Prometheus text format"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,93 @@
+"""Correctness corpus and micro-benchmark for profile location matching.
+
+Usage: python benchmarks/bench_location.py [lookups]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from location_matcher import LocationMatcher
+from x_analyzer import EAST_AFRICAN_LOCATIONS
+
+# (profile location, expected country or '' for no match)
+CORPUS = [
+    ('Nairobi, Kenya', 'kenya'),
+    ('nairobi', 'kenya'),
+    ('NAIROBI  KENYA', 'kenya'),
+    ('Mombasa 🇰🇪', 'kenya'),
+    ('KE', 'kenya'),
+    ('Dar es Salaam', 'tanzania'),
+    ('Dar es  Salaam, TZ', 'tanzania'),
+    ('Zanzibar', 'tanzania'),
+    ('Arusha | Tanzania', 'tanzania'),
+    ('Kampala, UG', 'uganda'),
+    ('Entebbe', 'uganda'),
+    ('Kigali, Rwanda', 'rwanda'),
+    ('rw', 'rwanda'),
+    ('Bujumbura', 'burundi'),
+    ('Gitega, BI', 'burundi'),
+    ('Kenya & Uganda', 'kenya'),
+    # Short codes must not match inside other words
+    ('Lake Placid, NY', ''),
+    ('Tokyo', ''),
+    ('Bike trails everywhere', ''),
+    ('Mumbai', ''),
+    ('Pittsburgh', ''),
+    ('Brwanda', ''),
+    ('Guluhead', ''),
+    ('London, UK', ''),
+    ('', ''),
+    (None, ''),
+]
+
+def substring_scan(locations, location):
+    """Naive reference: per-country substring scan, which misfires on short codes."""
+    if not location:
+        return False, ''
+    location = location.lower()
+    for country, keywords in locations.items():
+        if any(keyword in location for keyword in keywords):
+            return True, country
+    return False, ''
+
+def check_corpus(matcher: LocationMatcher):
+    failures = []
+    for location, expected in CORPUS:
+        is_match, country = matcher.match(location)
+        if country != expected or is_match != bool(expected):
+            failures.append((location, expected, country))
+    for location, expected, country in failures:
+        print(f"MISMATCH {location!r}: expected {expected!r}, got {country!r}")
+    print(f"Corpus: {len(CORPUS) - len(failures)}/{len(CORPUS)} correct")
+    return not failures
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    locations = EAST_AFRICAN_LOCATIONS
+    matcher = LocationMatcher(locations)
+    ok = check_corpus(matcher)
+
+    # Profile locations repeat heavily in real search pages
+    rng = random.Random(42)
+    pool = [location for location, _ in CORPUS if location] + [f'City {i}, Somewhere' for i in range(200)]
+    workload = [rng.choice(pool) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    for location in workload:
+        substring_scan(locations, location)
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for location in workload:
+        matcher.match(location)
+    compiled = time.perf_counter() - start
+
+    print(f"{lookups} lookups: substring scan {naive:.3f}s, compiled+memoized {compiled:.3f}s "
+          f"({naive / compiled:.1f}x), cache {matcher.cache_info()}")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
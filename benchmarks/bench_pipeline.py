@@ -0,0 +1,104 @@
+"""End-to-end benchmark of a topic search against recorded API responses.
+
+Record fixtures once (uses real API quota):
+    python benchmarks/bench_pipeline.py record "tech startups" --pages 5
+
+Replay them as often as needed, with simulated latency and rate limits:
+    python benchmarks/bench_pipeline.py replay "tech startups" --pages 5 --latency 0.05 --rate-limit 180
+
+Every run uses fresh caches, results and models in a temporary directory so
+repeat runs do the same work.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients import RecordingClient, ReplayClient
+from rate_limiter import RateLimitedClient, RateLimitScheduler
+from x_analyzer import XAnalyzer
+
+def make_analyzer(args, workdir: str) -> XAnalyzer:
+    scheduler = RateLimitScheduler()
+    if args.mode == 'record':
+        client = RecordingClient(RateLimitedClient.from_env(scheduler), args.fixtures)
+    else:
+        client = ReplayClient(
+            args.fixtures,
+            latency=args.latency,
+            rate_limit=args.rate_limit,
+            window=args.window,
+            scheduler=scheduler
+        )
+    return XAnalyzer(
+        cache_path=os.path.join(workdir, 'profiles.db'),
+        client=client,
+        max_workers=args.workers,
+        results_dir=os.path.join(workdir, 'results'),
+        model_dir=os.path.join(workdir, 'models'),
+        checkpoint_dir=os.path.join(workdir, 'checkpoints'),
+        scheduler=scheduler
+    )
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        analyzer = make_analyzer(args, workdir)
+
+        df, analyze_time = timed(analyzer.analyze_accounts, args.topic, max_pages=args.pages, resume=False)
+        timings = {'analyze_accounts': analyze_time}
+        if not df.empty:
+            # analyze_accounts already ranks once (bootstrapping the model); time a warm re-rank
+            _, timings['calculate_ai_rank'] = timed(analyzer.calculate_ai_rank, df)
+            _, timings['save_results'] = timed(analyzer.save_results, df, args.topic)
+
+        api_calls = sum(analyzer.api_calls.values())
+        return {
+            'timings': timings,
+            'total': sum(timings.values()),
+            'accounts': len(df),
+            'api_calls': dict(analyzer.api_calls),
+            'calls_per_account': api_calls / len(df) if len(df) else float('nan'),
+            'stats': analyzer.last_run_stats
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('topic')
+    parser.add_argument('--fixtures', default=os.path.join('benchmarks', 'fixtures'))
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--runs', type=int, default=3, help='replay runs to average')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per API call')
+    parser.add_argument('--rate-limit', type=int, default=None, help='simulated calls per window per endpoint')
+    parser.add_argument('--window', type=float, default=15 * 60, help='simulated rate limit window in seconds')
+    args = parser.parse_args()
+
+    runs = [run(args) for _ in range(1 if args.mode == 'record' else args.runs)]
+    last = runs[-1]
+
+    if args.mode == 'record':
+        print(f"\nRecorded {sum(last['api_calls'].values())} responses to {args.fixtures}")
+
+    print(f"\n{'stage':<20} {'mean':>9} {'min':>9}")
+    for stage in last['timings']:
+        times = [result['timings'][stage] for result in runs]
+        print(f"{stage:<20} {sum(times) / len(times):>8.3f}s {min(times):>8.3f}s")
+    totals = [result['total'] for result in runs]
+    print(f"{'end-to-end':<20} {sum(totals) / len(totals):>8.3f}s {min(totals):>8.3f}s")
+
+    print(f"\nAccepted accounts:    {last['accounts']}")
+    print(f"API calls:            {last['api_calls']}")
+    print(f"Calls per account:    {last['calls_per_account']:.1f}")
+    print(f"Search pages/sec:     {last['stats'].get('pages_per_second', 0)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark per-row Pydantic vs column-wise serialization of search result pages.
+
+Usage: python benchmarks/bench_serialization.py [page sizes...]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import ACCOUNT_SCHEMA, AccountBase, SearchResponse
+from serialization import compress, dumps, frame_records, orjson
+
+def make_page(n: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic ranked page with the column types calculate_ai_rank produces."""
+    rng = np.random.default_rng(seed)
+    countries = ['kenya', 'tanzania', 'uganda', 'rwanda', 'burundi']
+    return pd.DataFrame({
+        'username': [f'user{i}' for i in range(n)],
+        'name': [f'User {i}' for i in range(n)],
+        'location': rng.choice(['Nairobi, Kenya', 'Dar es Salaam', 'Kampala', 'Kigali'], size=n),
+        'country': pd.Categorical(rng.choice(countries, size=n), categories=countries),
+        'followers_count': rng.integers(1000, 1000000, size=n),
+        'annual_posts': rng.integers(365, 3200, size=n),
+        'thread_count': rng.integers(0, 500, size=n),
+        'activity_days': rng.integers(30, 366, size=n),
+        'category': rng.choice(['nano', 'micro', 'macro'], size=n),
+        'verified': rng.random(n) < 0.1,
+        'engagement_score': rng.random(n) * 10000,
+        'intensity_score': rng.random(n) * 50,
+        'ai_rank': rng.random(n),
+        'description': ['bio'] * n
+    })
+
+def per_row(df: pd.DataFrame) -> bytes:
+    """The previous implementation: one AccountBase per row, encoded by the framework."""
+    accounts = []
+    for _, row in df.iterrows():
+        accounts.append(AccountBase(
+            username=row["username"],
+            name=row["name"],
+            location=row["location"],
+            country=row["country"],
+            followers_count=row["followers_count"],
+            annual_posts=row["annual_posts"],
+            thread_count=row["thread_count"],
+            activity_days=row["activity_days"],
+            category=row["category"],
+            verified=row["verified"],
+            engagement_score=float(row["engagement_score"]),
+            intensity_score=float(row["intensity_score"]),
+            ai_rank=float(row["ai_rank"])
+        ))
+    response = SearchResponse(accounts=accounts, total_count=len(df))
+    return json.dumps(response.model_dump()).encode()
+
+def column_wise(df: pd.DataFrame) -> bytes:
+    return dumps({"accounts": frame_records(df, ACCOUNT_SCHEMA), "total_count": len(df)})
+
+def timed(func, *args, runs: int = 3):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json (pip install orjson for the fast path)'}")
+
+    print(f"{'rows':>8} {'per-row':>10} {'column-wise':>12} {'speedup':>8} {'gzip':>9} {'size':>9} {'gzipped':>9}")
+    for n in sizes:
+        df = make_page(n)
+        old, old_time = timed(per_row, df)
+        new, new_time = timed(column_wise, df)
+        assert json.loads(old) == json.loads(new)
+
+        (compressed, _), gzip_time = timed(compress, new, 'gzip')
+        assert gzip.decompress(compressed) == new
+        print(f"{n:>8} {old_time * 1000:>8.1f}ms {new_time * 1000:>10.1f}ms {old_time / new_time:>7.1f}x "
+              f"{gzip_time * 1000:>7.1f}ms {len(new) / 1024:>7.0f}KB {len(compressed) / 1024:>7.0f}KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Import-time report for the API and CLI entry points.
+
+Each entry point is imported in a fresh interpreter. The report shows the best
+import time over several runs against its target and the slowest modules it
+pulls in (from python -X importtime). Exits non-zero if a target is missed.
+
+Usage: python benchmarks/bench_startup.py [runs] [top]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds of import time each entry point is allowed. The API must not pull in
+# tweepy, scikit-learn or the analyzer until the first search runs.
+TARGETS = {
+    'api': 1.0,
+    'main': 0.1,
+    'x_analyzer': 1.5
+}
+
+# Modules that must stay out of an entry point's import graph
+DEFERRED = {
+    'api': ['x_analyzer', 'tweepy', 'sklearn', 'joblib', 'pandas'],
+    'main': ['x_analyzer', 'tweepy', 'sklearn', 'pandas'],
+    'x_analyzer': ['sklearn', 'joblib']
+}
+
+def import_times(module: str) -> dict:
+    """Cumulative microseconds per imported module for one fresh import."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    # Modules every interpreter loads at startup are not the entry point's cost
+    baseline = set(import_times('sys'))
+
+    missed = []
+    for module, target in TARGETS.items():
+        samples = [import_times(module) for _ in range(runs)]
+        best = min(samples, key=lambda times: times[module])
+        seconds = best[module] / 1e6
+        leaked = [name for name in DEFERRED[module] if name in best]
+        ok = seconds <= target and not leaked
+        if not ok:
+            missed.append(module)
+
+        print(f"\n{module}: {seconds:.3f}s (target {target:.2f}s) {'OK' if ok else 'MISSED'}")
+        if leaked:
+            print(f"  eagerly imports: {', '.join(leaked)}")
+        own = [name for name in best if name != module and name not in baseline]
+        slowest = sorted(own, key=best.get, reverse=True)
+        for name in slowest[:top]:
+            print(f"  {best[name] / 1e6:>7.3f}s  {name}")
+
+    sys.exit(1 if missed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark in-memory vs streaming ranking of accepted accounts.
+
+Reports peak traced memory and time for ranking N accounts both ways and
+checks that the streaming top N per category matches the full ranking.
+
+Usage: python benchmarks/bench_streaming.py [sizes...]
+"""
+import functools
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streaming_ranker import StreamingRanker
+from x_analyzer import METRIC_COLUMNS, XAnalyzer
+
+TOP_N = 100
+
+def accounts(n: int, seed: int = 42):
+    """Yield synthetic accepted accounts in the shape analyze_accounts produces."""
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        account = {
+            'username': f'user{i}',
+            'name': f'User {i}',
+            'location': 'Nairobi, Kenya',
+            'country': 'kenya',
+            'followers_count': int(rng.integers(1000, 1000000)),
+            'following_count': int(rng.integers(0, 5000)),
+            'tweet_count': int(rng.integers(365, 50000)),
+            'annual_posts': int(rng.integers(365, 3200)),
+            'thread_count': int(rng.integers(0, 500)),
+            'verified': False,
+            'description': 'Tech, startups and the East African ecosystem'
+        }
+        account.update({column: int(rng.integers(0, 5000)) for column in METRIC_COLUMNS})
+        yield account
+
+def in_memory(analyzer: XAnalyzer, n: int) -> pd.DataFrame:
+    """The default path: keep every account, then rank them all at once."""
+    collected = {account['username']: account for account in accounts(n)}
+    return analyzer.calculate_ai_rank(analyzer.build_accounts_frame(list(collected.values())))
+
+def streaming(analyzer: XAnalyzer, n: int) -> pd.DataFrame:
+    score_chunk = functools.partial(analyzer.rank_with, ranker=analyzer.get_ranker())
+    ranker = StreamingRanker(score_chunk, top_n=TOP_N, chunk_size=analyzer.stream_chunk_size)
+    for account in accounts(n):
+        ranker.add(account)
+    return ranker.result()
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        analyzer = XAnalyzer(
+            cache_path=os.path.join(workdir, 'profiles.db'),
+            results_dir=os.path.join(workdir, 'results'),
+            model_dir=os.path.join(workdir, 'models'),
+            checkpoint_dir=os.path.join(workdir, 'checkpoints')
+        )
+        # Train once up front: scoring never retrains, so both legs use the same model
+        training = analyzer.add_scores(analyzer.build_accounts_frame(list(accounts(5000, seed=1))))
+        analyzer.model_registry.train(training, analyzer.weights)
+        analyzer.get_ranker()
+
+        print(f"{'accounts':>10} {'in-memory':>10} {'peak':>9} {'streaming':>10} {'peak':>9}")
+        for n in sizes:
+            full, full_time, full_peak = measure(in_memory, analyzer, n)
+            top, top_time, top_peak = measure(streaming, analyzer, n)
+
+            expected = full.groupby('category', group_keys=False).apply(lambda group: group.nlargest(TOP_N, 'ai_rank'))
+            assert set(expected['username']) == set(top['username'])
+            print(f"{n:>10} {full_time:>9.2f}s {full_peak:>7.1f}MB {top_time:>9.2f}s {top_peak:>7.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+class CheckpointStore:
+    """JSON checkpoints of in-progress crawls, one file per topic and page budget.
+
+    A crawl capped at a different max_pages is a different crawl, so it
+    neither resumes from nor overwrites another budget's checkpoint.
+    """
+
+    def __init__(self, path: str = 'checkpoints'):
+        self.path = path
+
+    def _file(self, topic: str, max_pages: int) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '_', ' '.join(topic.lower().split())).strip('_') or 'topic'
+        return os.path.join(self.path, f'{slug}.{max_pages}p.json')
+
+    def load(self, topic: str, max_pages: int) -> Optional[Dict]:
+        """Return the saved crawl state for a topic and page budget, if any."""
+        try:
+            with open(self._file(topic, max_pages)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, topic: str, max_pages: int, state: Dict):
+        """Write the crawl state atomically so a crash never leaves a torn file.
+
+        Each writer uses its own temporary file, so concurrent runs of the same
+        crawl never interleave writes; the last complete checkpoint wins.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        path = self._file(topic, max_pages)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(dict(state, topic=topic, max_pages=max_pages, saved_at=time.time()), f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def clear(self, topic: str, max_pages: int):
+        try:
+            os.remove(self._file(topic, max_pages))
+        except FileNotFoundError:
+            pass
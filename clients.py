@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+import tweepy
+
+from rate_limiter import RateLimitScheduler
+
+# Data type each recorded method returns and the model class of each expansion
+RESPONSE_TYPES = {
+    'search_recent_tweets': tweepy.Tweet,
+    'get_users_tweets': tweepy.Tweet,
+    'get_users': tweepy.User
+}
+INCLUDE_TYPES = {
+    'users': tweepy.User,
+    'tweets': tweepy.Tweet,
+    'media': tweepy.Media,
+    'places': tweepy.Place,
+    'polls': tweepy.Poll
+}
+
+# Request parameters that change on every run and so are not part of a fixture's key
+VOLATILE_PARAMS = ('start_time', 'end_time')
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+def fixture_key(method: str, args: tuple, kwargs: Dict) -> str:
+    """Stable name for the response to one request."""
+    params = {key: value for key, value in kwargs.items() if key not in VOLATILE_PARAMS}
+    payload = json.dumps({'args': args, 'kwargs': params}, sort_keys=True, default=str)
+    return f"{method}_{hashlib.sha1(payload.encode()).hexdigest()[:16]}"
+
+class RecordingClient:
+    """Wraps an API client and writes every search, timeline and user lookup response to disk.
+
+    The fixtures directory can then be served back by a ReplayClient.
+    """
+
+    def __init__(self, client, path: str = 'fixtures'):
+        self.client = client
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _record(self, method: str, *args, **kwargs):
+        response = getattr(self.client, method)(*args, **kwargs)
+        data = response.data
+        fixture = {
+            'method': method,
+            'recorded_at': time.time(),
+            'data': [item.data for item in data] if isinstance(data, list) else (data.data if data else None),
+            'includes': {
+                key: [item.data for item in items]
+                for key, items in (response.includes or {}).items()
+            },
+            'errors': response.errors,
+            'meta': response.meta
+        }
+
+        tmp_path = os.path.join(self.path, f"{fixture_key(method, args, kwargs)}.json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(fixture, f)
+        os.replace(tmp_path, tmp_path[:-len('.tmp')])
+        return response
+
+    def search_recent_tweets(self, *args, **kwargs):
+        return self._record('search_recent_tweets', *args, **kwargs)
+
+    def get_users_tweets(self, *args, **kwargs):
+        return self._record('get_users_tweets', *args, **kwargs)
+
+    def get_users(self, *args, **kwargs):
+        return self._record('get_users', *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+class ReplayClient:
+    """Serves recorded responses in place of the X API.
+
+    Each call sleeps for latency seconds. With rate_limit set, every endpoint
+    allows that many calls per window and the resulting x-rate-limit-*
+    headers are reported to the scheduler, as RateLimitedClient does for live
+    responses. Timestamps are shifted by the fixture's age so one-year
+    timeline windows still line up with the recording.
+    """
+
+    def __init__(self, path: str = 'fixtures', latency: float = 0.0,
+                 rate_limit: Optional[int] = None, window: float = 15 * 60,
+                 scheduler: Optional[RateLimitScheduler] = None, shift_time: bool = True,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        if not os.path.isdir(path):
+            raise ValueError(f"No recorded fixtures in '{path}'")
+
+        self.path = path
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.scheduler = scheduler
+        self.shift_time = shift_time
+        self._clock = clock
+        self._sleep = sleep
+        self._windows = {}  # endpoint -> [calls left, reset time]
+        self._lock = threading.Lock()
+
+    def _headers(self, endpoint: str) -> Dict:
+        """Simulated rate-limit headers after one more call to the endpoint."""
+        with self._lock:
+            now = self._clock()
+            window = self._windows.get(endpoint)
+            if window is None or now >= window[1]:
+                window = self._windows[endpoint] = [self.rate_limit, now + self.window]
+            window[0] = max(0, window[0] - 1)
+            return {
+                'x-rate-limit-limit': str(self.rate_limit),
+                'x-rate-limit-remaining': str(window[0]),
+                'x-rate-limit-reset': str(window[1])
+            }
+
+    def _shift(self, item: Dict, offset: timedelta) -> Dict:
+        if offset and item.get('created_at'):
+            created_at = datetime.strptime(item['created_at'], TIME_FORMAT) + offset
+            item = dict(item, created_at=created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'))
+        return item
+
+    def _replay(self, method: str, *args, **kwargs) -> tweepy.Response:
+        fixture_path = os.path.join(self.path, f"{fixture_key(method, args, kwargs)}.json")
+        if not os.path.exists(fixture_path):
+            raise LookupError(f"No recorded response for {method} {args} {kwargs}")
+
+        with open(fixture_path) as f:
+            fixture = json.load(f)
+
+        if self.latency:
+            self._sleep(self.latency)
+        if self.rate_limit is not None and self.scheduler is not None:
+            self.scheduler.update(method, self._headers(method))
+
+        offset = timedelta(seconds=self._clock() - fixture['recorded_at']) if self.shift_time else None
+        model = RESPONSE_TYPES[method]
+        data = fixture['data']
+        if isinstance(data, list):
+            data = [model(self._shift(item, offset)) for item in data]
+        elif data is not None:
+            data = model(self._shift(data, offset))
+        includes = {
+            key: [INCLUDE_TYPES[key](self._shift(item, offset)) for item in items]
+            for key, items in fixture['includes'].items()
+        }
+        return tweepy.Response(data, includes, fixture['errors'], fixture['meta'])
+
+    def search_recent_tweets(self, *args, **kwargs):
+        return self._replay('search_recent_tweets', *args, **kwargs)
+
+    def get_users_tweets(self, *args, **kwargs):
+        return self._replay('get_users_tweets', *args, **kwargs)
+
+    def get_users(self, *args, **kwargs):
+        return self._replay('get_users', *args, **kwargs)
@@ -0,0 +1,18 @@
+# Selection criteria shared by the analyzer and the API, kept free of heavy
+# imports so endpoints that only list them stay cheap to load
+
+# East African countries and cities for strict location filtering
+EAST_AFRICAN_LOCATIONS = {
+    'tanzania': ['tanzania', 'dar es salaam', 'dodoma', 'arusha', 'mwanza', 'zanzibar', 'tz'],
+    'kenya': ['kenya', 'nairobi', 'mombasa', 'kisumu', 'nakuru', 'ke'],
+    'uganda': ['uganda', 'kampala', 'entebbe', 'jinja', 'gulu', 'ug'],
+    'rwanda': ['rwanda', 'kigali', 'butare', 'gisenyi', 'rw'],
+    'burundi': ['burundi', 'bujumbura', 'gitega', 'bi']
+}
+
+# Influencer category thresholds as [min, max) follower counts
+INFLUENCER_CATEGORIES = {
+    'nano': (1000, 10000),
+    'micro': (10000, 100000),
+    'macro': (100000, float('inf'))
+}
@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+class EnrichmentPool:
+    """Worker pool that enriches each author at most once.
+
+    Searches that share a pool (e.g. the topics of one batch) get the same
+    future back for an author another search already queued, so timeline
+    lookups are never repeated across them.
+    """
+
+    def __init__(self, enrich: Callable, max_workers: int = 4):
+        self.enrich = enrich
+        self.submitted = 0
+        self.shared = 0  # Requests served by another search's enrichment
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='enrich')
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user, refresh: bool = False) -> Tuple[Future, bool]:
+        """Queue an author's enrichment; returns its future and whether it was already queued."""
+        with self._lock:
+            future = self._futures.get(user.id)
+            if future is not None:
+                self.shared += 1
+                return future, True
+            future = self._futures[user.id] = self._executor.submit(self.enrich, user, refresh)
+            self.submitted += 1
+            return future, False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
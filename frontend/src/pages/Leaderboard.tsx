@@ -1,43 +1,42 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { Tab } from '@headlessui/react';
+import { Account, getLeaderboard } from '../services/api';
 
-interface Influencer {
-  username: string;
-  name: string;
-  category: string;
-  country: string;
-  followers: number;
-  engagement: number;
-  posts: number;
-  verified: boolean;
-}
+// Unchanged leaderboards are revalidated with ETags, so polling is cheap
+const POLL_INTERVAL_MS = 30000;
 
 const Leaderboard: React.FC = () => {
   const [selectedCategory, setSelectedCategory] = useState('all');
-  const [sortBy, setSortBy] = useState('engagement');
-
-  // Sample data
-  const influencers: Influencer[] = [
-    {
-      username: 'techboss',
-      name: 'Tech Boss',
-      category: 'micro',
-      country: 'Tanzania',
-      followers: 25000,
-      engagement: 4.8,
-      posts: 450,
-      verified: true,
-    },
-    // Add more sample data
-  ];
+  const [sortBy, setSortBy] = useState('ai_rank');
+  const [influencers, setInfluencers] = useState<Account[]>([]);
 
   const categories = ['all', 'nano', 'micro', 'macro'];
   const sortOptions = [
-    { value: 'engagement', label: 'Engagement Rate' },
-    { value: 'followers', label: 'Followers' },
-    { value: 'posts', label: 'Post Count' },
+    { value: 'ai_rank', label: 'AI Rank' },
+    { value: 'engagement_score', label: 'Engagement' },
+    { value: 'followers_count', label: 'Followers' },
+    { value: 'intensity_score', label: 'Posting Intensity' },
   ];
 
+  useEffect(() => {
+    let cancelled = false;
+    const load = async () => {
+      try {
+        const accounts = await getLeaderboard(selectedCategory, sortBy, 20);
+        if (!cancelled) setInfluencers(accounts);
+      } catch (err) {
+        console.error('Failed to load leaderboard', err);
+      }
+    };
+
+    load();
+    const timer = setInterval(load, POLL_INTERVAL_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, [selectedCategory, sortBy]);
+
   const formatNumber = (num: number): string => {
     if (num >= 1000000) return `${(num / 1000000).toFixed(1)}M`;
     if (num >= 1000) return `${(num / 1000).toFixed(1)}K`;
@@ -92,6 +91,11 @@ const Leaderboard: React.FC = () => {
               className="rounded-xl bg-white dark:bg-gray-800 p-3"
             >
               <div className="space-y-4">
+                {influencers.length === 0 && (
+                  <p className="p-4 text-gray-500 dark:text-gray-400">
+                    No ranked accounts yet.
+                  </p>
+                )}
                 {influencers
                   .filter(
                     (inf) =>
@@ -118,7 +122,7 @@ const Leaderboard: React.FC = () => {
                             )}
                           </div>
                           <p className="text-gray-500 dark:text-gray-400">
-                            {influencer.name} • {influencer.country}
+                            {influencer.name} • {influencer.country || 'Unknown'}
                           </p>
                         </div>
                       </div>
@@ -128,7 +132,7 @@ const Leaderboard: React.FC = () => {
                             Followers
                           </p>
                           <p className="text-lg font-semibold text-gray-900 dark:text-white">
-                            {formatNumber(influencer.followers)}
+                            {formatNumber(influencer.followers_count)}
                           </p>
                         </div>
                         <div className="text-center">
@@ -136,7 +140,7 @@ const Leaderboard: React.FC = () => {
                             Engagement
                           </p>
                           <p className="text-lg font-semibold text-gray-900 dark:text-white">
-                            {influencer.engagement}%
+                            {influencer.engagement_score.toFixed(1)}
                           </p>
                         </div>
                         <div className="text-center">
@@ -144,7 +148,8 @@ const Leaderboard: React.FC = () => {
                             Posts
                           </p>
                           <p className="text-lg font-semibold text-gray-900 dark:text-white">
-                            {formatNumber(influencer.posts)}
+                            {formatNumber(influencer.annual_posts)}
+                            {(influencer.activity_days ?? 365) < 365 && '+'}
                           </p>
                         </div>
                       </div>
@@ -1,5 +1,12 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { MagnifyingGlassIcon } from '@heroicons/react/24/outline';
+import {
+  Account,
+  SearchProgress,
+  createSearchJob,
+  getSearchJobResults,
+  searchJobEventsUrl,
+} from '../services/api';
 
 interface SearchFilters {
   country: string;
@@ -17,15 +24,72 @@ const Search: React.FC = () => {
     minEngagement: '',
   });
 
+  const [results, setResults] = useState<Account[]>([]);
+  const [progress, setProgress] = useState<SearchProgress | null>(null);
+  const [status, setStatus] = useState<'idle' | 'running' | 'done' | 'failed'>('idle');
+  const [error, setError] = useState<string | null>(null);
+  const eventSourceRef = useRef<EventSource | null>(null);
+
   const countries = ['all', 'tanzania', 'kenya', 'uganda', 'rwanda', 'burundi'];
   const categories = ['all', 'nano', 'micro', 'macro'];
 
-  const handleSearch = (e: React.FormEvent) => {
+  // Close any open event stream when leaving the page
+  useEffect(() => () => eventSourceRef.current?.close(), []);
+
+  const matchesFilters = (account: Account): boolean =>
+    (filters.country === 'all' || account.country.toLowerCase() === filters.country) &&
+    (filters.category === 'all' || account.category.toLowerCase() === filters.category) &&
+    (!filters.minFollowers || account.followers_count >= Number(filters.minFollowers)) &&
+    (!filters.minEngagement || account.engagement_score >= Number(filters.minEngagement));
+
+  const handleSearch = async (e: React.FormEvent) => {
     e.preventDefault();
-    // Implement search functionality
-    console.log('Search:', searchQuery, filters);
+    const topic = searchQuery.trim();
+    if (!topic) return;
+
+    eventSourceRef.current?.close();
+    setResults([]);
+    setProgress(null);
+    setError(null);
+    setStatus('running');
+
+    try {
+      const job = await createSearchJob(topic);
+      const source = new EventSource(searchJobEventsUrl(job.job_id));
+      eventSourceRef.current = source;
+
+      source.addEventListener('progress', (event) => {
+        setProgress(JSON.parse((event as MessageEvent).data));
+      });
+
+      // Render accounts as soon as the analyzer accepts them
+      source.addEventListener('account', (event) => {
+        const { account } = JSON.parse((event as MessageEvent).data);
+        setResults((previous) => [...previous, account]);
+      });
+
+      source.addEventListener('done', async (event) => {
+        source.close();
+        const data = JSON.parse((event as MessageEvent).data);
+        if (data.status === 'failed') {
+          setError(data.error);
+          setStatus('failed');
+          return;
+        }
+
+        // Replace the streamed previews with the final AI-ranked results
+        const ranked = await getSearchJobResults(job.job_id, { limit: 100 });
+        setResults(ranked.accounts);
+        setStatus('done');
+      });
+    } catch (err) {
+      setError('Search failed. Please try again.');
+      setStatus('failed');
+    }
   };
 
+  const visibleResults = results.filter(matchesFilters);
+
   return (
     <div className="space-y-6">
       <h1 className="text-3xl font-bold text-gray-900 dark:text-white">
@@ -133,12 +197,46 @@ const Search: React.FC = () => {
           <h2 className="text-lg font-semibold text-gray-900 dark:text-white">
             Search Results
           </h2>
+          {status === 'running' && progress && (
+            <p className="text-sm text-gray-500 dark:text-gray-400 mt-1">
+              Page {progress.pages}/{progress.max_pages} · {progress.candidates} candidates ·{' '}
+              {progress.accounts_accepted} accepted
+              {progress.rate_limit_wait > 0 &&
+                ` · waiting ${Math.ceil(progress.rate_limit_wait)}s for rate limit`}
+            </p>
+          )}
         </div>
         <div className="p-4">
-          {/* Add search results here */}
-          <p className="text-gray-500 dark:text-gray-400">
-            Enter a search query to find influencers...
-          </p>
+          {error && <p className="text-red-600 dark:text-red-400">{error}</p>}
+          {status === 'idle' && (
+            <p className="text-gray-500 dark:text-gray-400">
+              Enter a search query to find influencers...
+            </p>
+          )}
+          {status !== 'idle' && !error && visibleResults.length === 0 && (
+            <p className="text-gray-500 dark:text-gray-400">
+              {status === 'running' ? 'Analyzing accounts...' : 'No accounts found matching the criteria.'}
+            </p>
+          )}
+          <ul className="divide-y dark:divide-gray-700">
+            {visibleResults.map((account) => (
+              <li key={account.username} className="py-3 flex justify-between">
+                <div>
+                  <p className="font-medium text-gray-900 dark:text-white">
+                    {account.name}{' '}
+                    <span className="text-gray-500 dark:text-gray-400">@{account.username}</span>
+                  </p>
+                  <p className="text-sm text-gray-500 dark:text-gray-400">
+                    {account.location} · {account.category} · {account.followers_count.toLocaleString()} followers
+                  </p>
+                </div>
+                <div className="text-right text-sm text-gray-700 dark:text-gray-300">
+                  <p>Engagement {account.engagement_score.toFixed(1)}</p>
+                  <p>{account.ai_rank === null ? 'Ranking...' : `AI rank ${account.ai_rank.toFixed(2)}`}</p>
+                </div>
+              </li>
+            ))}
+          </ul>
         </div>
       </div>
     </div>
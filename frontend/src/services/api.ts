@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE_URL = 'http://localhost:8000';
+export const API_BASE_URL = 'http://localhost:8000';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -17,11 +17,12 @@ export interface Account {
   followers_count: number;
   annual_posts: number;
   thread_count: number;
+  activity_days?: number; // under 365 when annual_posts is a lower bound
   category: string;
   verified: boolean;
   engagement_score: number;
   intensity_score: number;
-  ai_rank: number;
+  ai_rank: number | null; // null for accounts streamed before the final ranking
 }
 
 export interface SearchResponse {
@@ -54,6 +55,58 @@ export const searchAccounts = async (params: {
   return response.data;
 };
 
+export interface SearchJob {
+  job_id: string;
+  topic: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  progress: Record<string, number | string>;
+  error: string | null;
+  total_count: number;
+}
+
+export const createSearchJob = async (
+  topic: string,
+  max_pages: number = 25
+): Promise<SearchJob> => {
+  const response = await api.post('/search/jobs', { topic, max_pages });
+  return response.data;
+};
+
+export const getSearchJob = async (jobId: string): Promise<SearchJob> => {
+  const response = await api.get(`/search/jobs/${jobId}`);
+  return response.data;
+};
+
+export interface SearchProgress {
+  stage: string;
+  pages: number;
+  max_pages: number;
+  candidates: number;
+  enrichment_queued: number;
+  accounts_accepted: number;
+  rate_limit_wait: number;
+}
+
+// Server-Sent Events stream with `progress`, `account` and `done` events
+export const searchJobEventsUrl = (jobId: string): string =>
+  `${API_BASE_URL}/search/jobs/${jobId}/events`;
+
+export const getSearchJobResults = async (
+  jobId: string,
+  params: {
+    country?: string;
+    category?: string;
+    min_followers?: number;
+    min_engagement?: number;
+    sort_by?: string;
+    page?: number;
+    limit?: number;
+  } = {}
+): Promise<SearchResponse> => {
+  const response = await api.get(`/search/jobs/${jobId}/results`, { params });
+  return response.data;
+};
+
 export const getLeaderboard = async (
   category: string = 'all',
   sort_by: string = 'ai_rank',
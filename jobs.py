@@ -0,0 +1,229 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from result_cache import ResultCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class SearchJob:
+    """A topic search, or a batch of topic searches, running in the background."""
+
+    def __init__(self, topic: str, max_pages: int, topics: Optional[List[str]] = None,
+                 stream_top_n: Optional[int] = None):
+        self.id = uuid.uuid4().hex
+        self.topic = topic
+        self.topics = topics  # Set for batch jobs, whose topic is the joined list
+        self.max_pages = max_pages
+        self.stream_top_n = stream_top_n  # Keep only the top N per category, saving chunks as they stream
+        self.status = 'queued'  # queued -> running -> done | failed
+        self.progress = {}
+        self.result: Optional['pd.DataFrame'] = None  # Combined leaderboard for batch jobs
+        self.rankings: Dict[str, 'pd.DataFrame'] = {}  # Per-topic rankings of a batch
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self.events: List[Dict] = []  # Every event so far, each with a sequence id
+        self._events_changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def record(self, event: Dict):
+        """Store an analyzer event and wake any streaming readers."""
+        with self._events_changed:
+            if event.get('type') == 'progress':
+                self.progress = {key: value for key, value in event.items() if key != 'type'}
+            elif event.get('type') == 'done':
+                self.status = event['status']
+            self.events.append(dict(event, id=len(self.events) + 1))
+            self._events_changed.notify_all()
+
+    def events_since(self, last_id: int, timeout: float = 1.0) -> List[Dict]:
+        """Events after last_id, waiting up to timeout for new ones."""
+        with self._events_changed:
+            if len(self.events) <= last_id and not self.finished:
+                self._events_changed.wait(timeout)
+            return self.events[last_id:]
+
+    @property
+    def key(self) -> str:
+        if self.topics is not None:
+            return batch_key(self.topics, self.max_pages, self.stream_top_n)
+        return job_key(self.topic, self.max_pages, self.stream_top_n)
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'topic': self.topic,
+            'topics': self.topics,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'total_count': len(self.result) if self.result is not None else 0
+        }
+
+def _stream_suffix(stream_top_n: Optional[int]) -> str:
+    # A streamed search returns only the top N, so it never shares a job with a full one
+    return f'|top{stream_top_n}' if stream_top_n is not None else ''
+
+def job_key(topic: str, max_pages: int, stream_top_n: Optional[int] = None) -> str:
+    """Normalize a search so identical topics share one job."""
+    return f"{' '.join(topic.lower().split())}|{max_pages}" + _stream_suffix(stream_top_n)
+
+def batch_key(topics: List[str], max_pages: int, stream_top_n: Optional[int] = None) -> str:
+    """Normalize a batch so the same set of topics shares one job, in any order."""
+    return ('batch|' + '|'.join(sorted({' '.join(topic.lower().split()) for topic in topics}))
+            + f'|{max_pages}' + _stream_suffix(stream_top_n))
+
+class JobManager:
+    """Runs analyzer searches on a worker pool, merging identical in-flight topics.
+
+    Finished rankings are kept in a ResultCache so repeat searches, page
+    changes and filter changes are served without re-running the analysis.
+    """
+
+    def __init__(self, analyzer, max_workers: int = 2, retention: int = 3600,
+                 cache: Optional[ResultCache] = None):
+        self.analyzer = analyzer
+        self.cache = cache if cache is not None else ResultCache()
+        self.retention = retention  # Seconds finished jobs stay available
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-job')
+        self._jobs: Dict[str, SearchJob] = {}
+        self._in_flight: Dict[str, SearchJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, topic: str, max_pages: int = 25, refresh: bool = False,
+               stream_top_n: Optional[int] = None) -> SearchJob:
+        """Queue a search, or return the job already running for the same topic.
+
+        A search with a fresh cached ranking returns an already finished job
+        holding it, without touching the worker pool, unless refresh is set.
+        With stream_top_n set the search is streamed (see analyze_accounts).
+        """
+        with self._lock:
+            self._prune()
+            key = job_key(topic, max_pages, stream_top_n)
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+
+            job = SearchJob(topic, max_pages, stream_top_n=stream_top_n)
+            self._jobs[job.id] = job
+            cached = None if refresh else self.cache.get(key)
+            if cached is not None:
+                self._finish_cached(job, cached)
+                return job
+
+            self._in_flight[key] = job
+            job.future = self._executor.submit(self._run, job)
+            return job
+
+    def submit_batch(self, topics: List[str], max_pages: int = 25,
+                     stream_top_n: Optional[int] = None) -> SearchJob:
+        """Queue a batch of topics analyzed together, or return the identical batch already running."""
+        with self._lock:
+            self._prune()
+            key = batch_key(topics, max_pages, stream_top_n)
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+
+            job = SearchJob(', '.join(topics), max_pages, topics=list(topics), stream_top_n=stream_top_n)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            job.future = self._executor.submit(self._run_batch, job)
+            return job
+
+    def cached_result(self, topic: str, max_pages: int = 25) -> Optional['pd.DataFrame']:
+        """Return the cached ranking for a search, if one is still fresh."""
+        return self.cache.get(job_key(topic, max_pages))
+
+    def _finish_cached(self, job: SearchJob, df: 'pd.DataFrame'):
+        """Complete a job immediately with a cached ranking."""
+        job.result = df
+        job.future = Future()
+        job.future.set_result(df)
+        job.finished_at = time.time()
+        job.record({'type': 'done', 'status': 'done', 'total_count': len(df), 'cached': True})
+
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: SearchJob) -> 'pd.DataFrame':
+        job.status = 'running'
+        try:
+            job.result = self.analyzer.analyze_accounts(
+                job.topic,
+                max_pages=job.max_pages,
+                on_progress=job.record,
+                stream_top_n=job.stream_top_n
+            )
+            # A crawl cut short returns a partial ranking: serve it, but let the next search resume
+            if not job.progress.get('interrupted'):
+                self.cache.put(job.key, job.result)
+            job.record({'type': 'done', 'status': 'done', 'total_count': len(job.result)})
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.record({'type': 'done', 'status': 'failed', 'error': job.error})
+            raise
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+
+    def _run_batch(self, job: SearchJob) -> 'pd.DataFrame':
+        job.status = 'running'
+        interrupted = set()  # Topics whose crawl was cut short
+
+        def record(event: Dict):
+            if event.get('interrupted'):
+                interrupted.add(event['topic'])
+            job.record(event)
+
+        try:
+            job.rankings, job.result = self.analyzer.analyze_topics(
+                job.topics,
+                max_pages=job.max_pages,
+                on_progress=record,
+                stream_top_n=job.stream_top_n
+            )
+            if job.stream_top_n is None:
+                self.analyzer.save_batch_results(job.rankings, job.result)  # Streamed chunks are already saved
+
+            # Each complete topic ranking also answers later single-topic searches
+            for topic, df in job.rankings.items():
+                if topic not in interrupted:
+                    self.cache.put(job_key(topic, job.max_pages, job.stream_top_n), df)
+            job.record({'type': 'done', 'status': 'done', 'total_count': len(job.result)})
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.record({'type': 'done', 'status': 'failed', 'error': job.error})
+            raise
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window."""
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def shutdown(self):
+        # Cancel queued jobs by hand; Executor.shutdown only grew cancel_futures in 3.9
+        with self._lock:
+            for job in self._jobs.values():
+                if job.future is not None:
+                    job.future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from criteria import INFLUENCER_CATEGORIES
+from results_store import SORT_COLUMNS, ResultsStore
+from serialization import dumps
+
+if TYPE_CHECKING:
+    from results_snapshot import ResultsSnapshot
+
+class LeaderboardViews:
+    """In-memory top accounts per (category, sort column), kept in step with a ResultsStore.
+
+    Upserts through the same store refresh only the views they touch.
+    Commits from other processes (e.g. a CLI run) change the store's data
+    version, and every view is rebuilt on the next read. Limits deeper than
+    the views are read from the shared results snapshot when one is given.
+    """
+
+    def __init__(self, store: ResultsStore, size: int = 100, categories: Optional[List[str]] = None,
+                 snapshot: Optional['ResultsSnapshot'] = None):
+        self.store = store
+        self.snapshot = snapshot
+        self.size = size  # Deepest limit served from memory
+        self.categories = ['all'] + list(categories or INFLUENCER_CATEGORIES)
+        self._views: Dict[Tuple[str, str], Dict] = {}  # (category, sort_by) -> accounts and bodies per limit
+        self._data_version = store.data_version()
+        self._lock = threading.Lock()
+        store.add_listener(self.refresh)
+        store.add_remove_listener(self.remove)
+
+    def build(self):
+        """Materialize every view from the store."""
+        with self._lock:
+            self._data_version = self.store.data_version()
+            for category in self.categories:
+                for sort_by in SORT_COLUMNS:
+                    self._load(category, sort_by)
+
+    def _load(self, category: str, sort_by: str) -> Dict:
+        view = self._views[(category, sort_by)] = {
+            'accounts': self.store.leaderboard(category, sort_by, self.size),
+            'responses': {}
+        }
+        return view
+
+    @staticmethod
+    def _sort_key(sort_by: str):
+        # Same order as ORDER BY ... DESC in SQLite, which puts NULLs last
+        return lambda account: (account[sort_by] is not None, account[sort_by] or 0)
+
+    def refresh(self, records: List[Dict]):
+        """Fold freshly upserted accounts into the views they belong to."""
+        updated = {record['username']: dict(record, verified=bool(record['verified'])) for record in records}
+
+        with self._lock:
+            for (category, sort_by), view in list(self._views.items()):
+                current = view['accounts']
+                incoming = [
+                    account for account in updated.values()
+                    if category == 'all' or account['category'] == category
+                ]
+                if not incoming and not any(account['username'] in updated for account in current):
+                    continue
+
+                sort_key = self._sort_key(sort_by)
+                merged = [account for account in current if account['username'] not in updated] + incoming
+                dropped = any(
+                    sort_key(updated[account['username']]) < sort_key(account)
+                    for account in current if account['username'] in updated
+                )
+                if len(current) >= self.size and (len(merged) < self.size or dropped):
+                    # A member left or fell within a full view; only the store knows what comes next
+                    self._load(category, sort_by)
+                    continue
+
+                merged.sort(key=sort_key, reverse=True)
+                view['accounts'] = merged[:self.size]
+                view['responses'] = {}
+
+    def remove(self, usernames: List[str]):
+        """Reload the views that listed any of the deleted accounts."""
+        removed = set(usernames)
+        with self._lock:
+            for (category, sort_by), view in list(self._views.items()):
+                if any(account['username'] in removed for account in view['accounts']):
+                    self._load(category, sort_by)
+
+    def _lookup(self, category: str, sort_by: str, limit: int) -> Tuple[List[Dict], bytes, str]:
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+        category = category.lower()
+
+        if limit > self.size:
+            # Deeper than the materialized views: from the mapped snapshot, else the indexed store
+            accounts = self.snapshot.leaderboard(category, sort_by, limit) if self.snapshot is not None else None
+            if accounts is None:
+                accounts = self.store.leaderboard(category, sort_by, limit)
+            body = dumps(accounts)
+            return accounts, body, self._etag(body)
+
+        with self._lock:
+            data_version = self.store.data_version()
+            if data_version != self._data_version:
+                self._views.clear()
+                self._data_version = data_version
+
+            view = self._views.get((category, sort_by)) or self._load(category, sort_by)
+            accounts = view['accounts'][:limit]
+            response = view['responses'].get(limit)
+            if response is None:
+                body = dumps(accounts)
+                response = view['responses'][limit] = (body, self._etag(body))
+            return (accounts, *response)
+
+    def get(self, category: str = 'all', sort_by: str = 'ai_rank', limit: int = 10) -> Tuple[List[Dict], str]:
+        """Top accounts for a view and their ETag."""
+        accounts, _, etag = self._lookup(category, sort_by, limit)
+        return accounts, etag
+
+    def get_json(self, category: str = 'all', sort_by: str = 'ai_rank', limit: int = 10) -> Tuple[bytes, str]:
+        """Top accounts for a view serialized as JSON, cached until the view changes, and their ETag."""
+        _, body, etag = self._lookup(category, sort_by, limit)
+        return body, etag
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
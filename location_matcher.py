@@ -0,0 +1,49 @@
+import functools
+import re
+from typing import Dict, List, Tuple
+
+class LocationMatcher:
+    """Match free-text profile locations against East African place names.
+
+    Every keyword is compiled into one word-bounded regex, so short codes
+    like 'ke' or 'tz' only match as whole tokens, and results are memoized
+    on the normalized location string.
+    """
+
+    def __init__(self, locations: Dict[str, List[str]], cache_size: int = 16384):
+        self._country_order = {country: index for index, country in enumerate(locations)}
+        self._keyword_country = {}
+        for country, keywords in locations.items():
+            for keyword in keywords:
+                self._keyword_country.setdefault(keyword.lower(), country)
+
+        # Longest names first so 'dar es salaam' wins over any shorter overlap
+        alternatives = sorted(self._keyword_country, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(keyword).replace(r'\ ', r'\s+') for keyword in alternatives) + r')\b'
+        )
+        self._lookup = functools.lru_cache(maxsize=cache_size)(self._match_normalized)
+
+    @staticmethod
+    def normalize(location: str) -> str:
+        return ' '.join(location.lower().split())
+
+    def _match_normalized(self, location: str) -> Tuple[bool, str]:
+        countries = {
+            self._keyword_country[re.sub(r'\s+', ' ', match.group(0))]
+            for match in self._pattern.finditer(location)
+        }
+        if not countries:
+            return False, ''
+
+        # Same precedence as the configured country order
+        return True, min(countries, key=self._country_order.get)
+
+    def match(self, location: str) -> Tuple[bool, str]:
+        """Return whether a location is in East Africa and which country it names."""
+        if not location:
+            return False, ''
+        return self._lookup(self.normalize(location))
+
+    def cache_info(self):
+        return self._lookup.cache_info()
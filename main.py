@@ -1,4 +1,4 @@
-from x_analyzer import XAnalyzer
+import argparse
 import sys
 
 def display_menu():
@@ -21,6 +21,7 @@ def display_parameters():
     print("\nFiltering Criteria:")
     print("- Location: Must be in East Africa (Tanzania, Kenya, Uganda, Rwanda, Burundi)")
     print("- Activity: Minimum 365 original posts per year")
+    print("- Followers: At least 1K (the nano influencer floor)")
     print("- Content: Only original posts (not retweets/replies)")
     print("\nAI Ranking Weights:")
     print("- Engagement: 40% (likes, retweets, replies)")
@@ -61,17 +62,32 @@ def format_number(num):
         return f"{num/1000:.1f}K"
     return str(num)
 
+def format_posts(account):
+    """Format annual posts, marking counts from a timeline scan stopped early as lower bounds."""
+    posts = format_number(account['annual_posts'])
+    return f"{posts}+" if account.get('activity_days', 365) < 365 else posts
+
 def format_score(score):
     """Format score values for display."""
     return f"{score:.2f}"
 
-def main():
-    analyzer = XAnalyzer()
+def print_profile():
+    """Print where the time of the analyses so far went."""
+    from metrics import format_summary
+    print("\n⏱ Profile:")
+    print(format_summary())
+
+def main(profile=False, stream_top=None):
+    analyzer = None  # Built on the first analysis so the menu shows up immediately
     
     while True:
         choice = display_menu()
         
         if choice == '1':
+            if analyzer is None:
+                from x_analyzer import XAnalyzer
+                analyzer = XAnalyzer()
+                
             # Get topic and analyze
             topic = get_topic()
             print(f"\nAnalyzing accounts related to '{topic}'...")
@@ -79,7 +95,7 @@ def main():
             print("Only accounts meeting all criteria will be shown.")
             
             # Perform analysis
-            results_df = analyzer.analyze_accounts(topic)
+            results_df = analyzer.analyze_accounts(topic, stream_top_n=stream_top)
             
             if results_df is not None and not results_df.empty:
                 # First show overall AI rankings
@@ -92,7 +108,7 @@ def main():
                         print(f"  📍 {account['location']} ({account['country'].title()})")
                         print(f"  🏅 Category: {account['category'].title()} Influencer")
                         print(f"  👥 Followers: {format_number(account['followers_count'])}")
-                        print(f"  📊 Annual Posts: {format_number(account['annual_posts'])}")
+                        print(f"  📊 Annual Posts: {format_posts(account)}")
                         print(f"  🧵 Threads: {account['thread_count']}")
                         if account['verified']:
                             print("  ✓ Verified account")
@@ -117,17 +133,23 @@ def main():
                                 value = format_score(account[param])
                             
                             print(f"  {param}: {value}")
-                            print(f"  📝 {format_number(account['annual_posts'])} posts/year")
+                            print(f"  📝 {format_posts(account)} posts/year")
                             print(f"  🧵 {account['thread_count']} threads")
                             if account['verified']:
                                 print("  ✓ Verified account")
                             print()
                 
-                # Save results
-                saved_file = analyzer.save_results(results_df, topic)
+                # Save results; streamed chunks were already saved as they were scored
+                if stream_top is not None:
+                    saved_file = None
+                    print(f"\n📁 All {analyzer.last_run_stats['accounts_found']} ranked accounts were saved as they streamed.")
+                else:
+                    saved_file = analyzer.save_results(results_df, topic)
                 if saved_file:
                     print(f"\n📁 Full results have been saved to: {saved_file}")
-                    print("The CSV file contains additional metrics and details about each account.")
+                    print("They contain additional metrics and details about each account.")
+                if profile:
+                    print_profile()
             else:
                 print("\n❌ No accounts found matching the criteria.")
                 print("\nPossible reasons:")
@@ -154,9 +176,114 @@ def main():
         
         input("\nPress Enter to continue...")
 
+def run_batch(topics, max_pages=25, profile=False, stream_top=None):
+    """Analyze a batch of topics at once and save them together."""
+    from x_analyzer import XAnalyzer
+    analyzer = XAnalyzer()
+    
+    print(f"\nAnalyzing {len(topics)} topics in one batch...")
+    rankings, combined = analyzer.analyze_topics(topics, max_pages=max_pages, stream_top_n=stream_top)
+    
+    for topic, results_df in rankings.items():
+        print(f"\n🏆 Top accounts for '{topic}':")
+        print("=" * 60)
+        top_accounts = analyzer.get_top_accounts(results_df, 'ai_rank', n=5)
+        if top_accounts is None:
+            print("  No accounts found matching the criteria.")
+            continue
+        for _, account in top_accounts.iterrows():
+            print(f"@{account['username']} ({account['country'].title()}, "
+                  f"{account['category'].title()}) - AI rank {format_score(account['ai_rank'])}")
+    
+    if combined.empty:
+        print("\n❌ No accounts found matching the criteria for any topic.")
+        if profile:
+            print_profile()
+        return
+        
+    print("\n🌍 Combined leaderboard across all topics:")
+    print("=" * 60)
+    for _, account in combined.head(10).iterrows():
+        print(f"@{account['username']} ({account['name']})")
+        print(f"  📍 {account['location']} ({account['country'].title()})")
+        print(f"  👥 Followers: {format_number(account['followers_count'])}")
+        print(f"  🏷 Topics: {account['topic']}")
+        print()
+    
+    if stream_top is not None:
+        print("\n📁 Per-topic results were saved as they streamed.")
+    else:
+        saved_file = analyzer.save_batch_results(rankings, combined)
+        if saved_file:
+            print(f"\n📁 Per-topic results have been saved to: {saved_file}")
+    if profile:
+        print_profile()
+
+def run_train_ranker():
+    """Train a new ranking model version on every saved account."""
+    from model_registry import MIN_TRAINING_SAMPLES
+    from x_analyzer import XAnalyzer
+    analyzer = XAnalyzer()
+    
+    saved = len(analyzer.results_store)
+    if saved < MIN_TRAINING_SAMPLES:
+        print(f"\n❌ Only {saved} saved accounts; at least {MIN_TRAINING_SAMPLES} are needed to train.")
+        return
+    version = analyzer.train_ranker()
+    print(f"\n✅ Trained ranking model v{version} on {saved} saved accounts.")
+    print("Ranks saved before this version were scored by an earlier model; re-rank them with --refresh-accounts.")
+
+def run_refresh(profile=False):
+    """Refresh the profiles of every saved account with batched user lookups."""
+    from x_analyzer import XAnalyzer
+    analyzer = XAnalyzer()
+    
+    print("\nRefreshing saved accounts...")
+    refreshed = analyzer.refresh_accounts()
+    if refreshed.empty:
+        print("\n❌ No saved accounts could be refreshed.")
+    else:
+        print("\n🏆 Top accounts after the refresh:")
+        print("=" * 60)
+        for _, account in refreshed.head(10).iterrows():
+            print(f"@{account['username']} - {format_number(account['followers_count'])} followers, "
+                  f"AI rank {format_score(account['ai_rank'])}")
+    if profile:
+        print_profile()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="X Account Analyzer for East Africa")
+    parser.add_argument('--topics', nargs='+', default=[], help="analyze these topics in one batch")
+    parser.add_argument('--topics-file', help="file with one topic per line to analyze in one batch")
+    parser.add_argument('--max-pages', type=int, default=25, help="search pages per topic")
+    parser.add_argument('--stream-top', type=int, metavar='N',
+                        help="keep only the top N accounts per category in memory, saving every scored chunk")
+    parser.add_argument('--refresh-accounts', action='store_true',
+                        help="refresh follower counts and profiles of all saved accounts")
+    parser.add_argument('--train-ranker', action='store_true',
+                        help="train a new ranking model version on all saved accounts")
+    parser.add_argument('--profile', action='store_true', help="print stage timings and API usage after each analysis")
+    args = parser.parse_args()
+    if args.stream_top is not None and args.stream_top < 1:
+        parser.error("--stream-top must be at least 1")
+    return args
+
 if __name__ == "__main__":
+    args = parse_args()
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file) as f:
+            topics += [line.strip() for line in f if line.strip()]
+    
     try:
-        main()
+        if args.train_ranker:
+            run_train_ranker()
+        elif args.refresh_accounts:
+            run_refresh(profile=args.profile)
+        elif topics:
+            run_batch(topics, max_pages=args.max_pages, profile=args.profile, stream_top=args.stream_top)
+        else:
+            main(profile=args.profile, stream_top=args.stream_top)
     except KeyboardInterrupt:
         print("\n\nProgram terminated by user.")
         sys.exit(0)
@@ -0,0 +1,163 @@
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, float('inf'))
+
+def _labels_key(labels: Dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key: Tuple, extra: Optional[Dict] = None) -> str:
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in items) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = 'counter'
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[Tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+class _Timer(ContextDecorator):
+    def __init__(self, histogram: 'Histogram', labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # Decorated functions may run on several threads at once; each call gets its own timer
+        return _Timer(self.histogram, self.labels)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+class Histogram:
+    """Latency histogram with cumulative buckets, sum, count and max per label set."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._series: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0, 'max': 0.0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+            series['max'] = max(series['max'], value)
+
+    def time(self, **labels) -> _Timer:
+        """Time a block or, as a decorator, every call of a function."""
+        return _Timer(self, labels)
+
+    def series(self) -> Dict[Tuple, Dict]:
+        with self._lock:
+            return {key: dict(series, counts=list(series['counts'])) for key, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self.series().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+class Registry:
+    """Process-wide collection of metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+API_CALLS = REGISTRY.register(Counter(
+    'xanalyzer_api_calls_total', 'X API requests made, by endpoint'
+))
+RATE_LIMIT_WAIT = REGISTRY.register(Counter(
+    'xanalyzer_rate_limit_wait_seconds_total', 'Seconds spent waiting for rate limit windows, by endpoint'
+))
+CANDIDATES_PRUNED = REGISTRY.register(Counter(
+    'xanalyzer_candidates_pruned_total', 'Search authors dropped before ranking, by reason'
+))
+ACCOUNTS_ACCEPTED = REGISTRY.register(Counter(
+    'xanalyzer_accounts_accepted_total', 'Authors that met every criterion'
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'xanalyzer_stage_seconds', 'Latency of analyzer stages'
+))
+
+def format_summary() -> str:
+    """Human-readable profile of everything recorded so far, for the CLI."""
+    lines = [f"\n{'stage':<16} {'count':>7} {'total':>10} {'mean':>9} {'max':>9}"]
+    for key, series in sorted(STAGE_SECONDS.series().items()):
+        stage = dict(key).get('stage', '')
+        mean = series['sum'] / series['count'] if series['count'] else 0.0
+        lines.append(f"{stage:<16} {series['count']:>7} {series['sum']:>9.2f}s {mean:>8.3f}s {series['max']:>8.3f}s")
+
+    def by_label(counter: Counter, label: str) -> str:
+        values = {dict(key).get(label, ''): value for key, value in sorted(counter.values().items())}
+        return ', '.join(f"{name}={value:g}" for name, value in values.items()) or 'none'
+
+    lines.append(f"\nAPI calls:        {by_label(API_CALLS, 'endpoint')}")
+    lines.append(f"Rate limit wait:  {by_label(RATE_LIMIT_WAIT, 'endpoint')} (seconds)")
+    lines.append(f"Pruned:           {by_label(CANDIDATES_PRUNED, 'reason')}")
+    lines.append(f"Accepted:         {sum(ACCOUNTS_ACCEPTED.values().values()):g}")
+    return '\n'.join(lines)
@@ -0,0 +1,171 @@
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# joblib and scikit-learn are imported on first train or load; they dominate
+# import time and most processes never rank anything
+
+FEATURE_COLUMNS = ['engagement_score', 'intensity_score', 'follower_score']
+
+# Same weighting the CLI documents for the overall AI rank
+DEFAULT_WEIGHTS = {
+    'engagement': 0.4,
+    'intensity': 0.4,
+    'followers': 0.2
+}
+
+# Fewer scored accounts than this can't fit a model worth keeping; the blend is used instead
+MIN_TRAINING_SAMPLES = 50
+
+# Fixed (low, high) feature ranges the blend is scaled by, so its scores compare across searches:
+# engagement of the sampled search tweets, annualized posting intensity and log followers (1K-10M)
+BLEND_RANGES = {
+    'engagement_score': (0.0, 10000.0),
+    'intensity_score': (0.0, 200.0),
+    'follower_score': (np.log1p(1000), np.log1p(10000000))
+}
+
+def ranking_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Model inputs for a scored accounts frame."""
+    return pd.DataFrame({
+        'engagement_score': df['engagement_score'].to_numpy(dtype='float64'),
+        'intensity_score': df['intensity_score'].to_numpy(dtype='float64'),
+        'follower_score': np.log1p(df['followers_count'].to_numpy(dtype='float64'))  # Log transform for better scaling
+    }, index=df.index)
+
+def blend_scores(df: pd.DataFrame, weights: Optional[Dict] = None) -> np.ndarray:
+    """The documented weighted blend of the features, scaled by the fixed BLEND_RANGES.
+
+    Used until a model is trained. The scaling does not depend on the other
+    accounts in df, so an account scores the same in every search.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    features = ranking_features(df)[FEATURE_COLUMNS].to_numpy()
+    low, high = np.array([BLEND_RANGES[column] for column in FEATURE_COLUMNS]).T
+    scaled = np.clip((features - low) / (high - low), 0.0, 1.0)
+    return scaled @ np.array([weights['engagement'], weights['intensity'], weights['followers']])
+
+class ModelRegistry:
+    """Versioned on-disk store of fitted ranking models.
+
+    Each version holds the fitted scaler and regressor together so scores
+    from different searches stay comparable until a new version is trained.
+    """
+
+    def __init__(self, path: str = 'models', n_jobs: int = -1, batch_size: int = 50000):
+        self.path = path
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+    def _model_path(self, version: int) -> str:
+        return os.path.join(self.path, f'ranker_v{version}.joblib')
+
+    def versions(self) -> list:
+        if not os.path.isdir(self.path):
+            return []
+        matches = (re.fullmatch(r'ranker_v(\d+)\.joblib', file) for file in os.listdir(self.path))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    def latest_version(self) -> Optional[int]:
+        latest_file = os.path.join(self.path, 'LATEST')
+        if os.path.exists(latest_file):
+            with open(latest_file) as f:
+                return int(f.read().strip())
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def train(self, df: pd.DataFrame, weights: Optional[Dict] = None, n_estimators: int = 100,
+              min_samples: int = MIN_TRAINING_SAMPLES) -> int:
+        """Fit a scaler and model on scored accounts and register them as a new version."""
+        import joblib
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import MinMaxScaler
+
+        weights = weights or DEFAULT_WEIGHTS
+        features = ranking_features(df).dropna()
+        if len(features) < min_samples:
+            raise ValueError(f"Need at least {min_samples} scored accounts to train on, got {len(features)}")
+
+        scaler = MinMaxScaler()
+        features_scaled = scaler.fit_transform(features)
+
+        # Target is the documented weighted blend of the normalized features
+        target = features_scaled @ np.array([weights['engagement'], weights['intensity'], weights['followers']])
+
+        model = RandomForestRegressor(n_estimators=n_estimators, random_state=42, n_jobs=self.n_jobs)
+        model.fit(features_scaled, target)
+
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            version = (self.versions() or [0])[-1] + 1
+            joblib.dump({
+                'version': version,
+                'scaler': scaler,
+                'model': model,
+                'weights': weights,
+                'feature_columns': FEATURE_COLUMNS,
+                'n_samples': len(features),
+                'trained_at': time.time()
+            }, self._model_path(version))
+
+            # Point LATEST at the new version atomically
+            tmp_path = os.path.join(self.path, 'LATEST.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(str(version))
+            os.replace(tmp_path, os.path.join(self.path, 'LATEST'))
+
+        return version
+
+    def load(self, version: Optional[int] = None) -> Optional[Dict]:
+        """Load a registered version, the latest by default."""
+        version = version if version is not None else self.latest_version()
+        if version is None or not os.path.exists(self._model_path(version)):
+            return None
+
+        import joblib
+        ranker = joblib.load(self._model_path(version))
+        ranker['model'].set_params(n_jobs=self.n_jobs)
+        return ranker
+
+    @staticmethod
+    def out_of_range(ranker: Dict, df: pd.DataFrame) -> int:
+        """Accounts with a feature outside the range the version was fitted on.
+
+        The forest can't extrapolate, so all of them score like the most
+        extreme training account.
+        """
+        features = ranking_features(df).to_numpy()
+        scaler = ranker['scaler']
+        outside = (features < scaler.data_min_) | (features > scaler.data_max_)
+        return int(outside.any(axis=1).sum())
+
+    def score(self, ranker: Dict, df: pd.DataFrame) -> np.ndarray:
+        """Score accounts with a loaded version in fixed-size batches, without refitting."""
+        features = ranking_features(df)
+        scores = np.empty(len(features), dtype='float64')
+        for start in range(0, len(features), self.batch_size):
+            batch = features.iloc[start:start + self.batch_size]
+            scores[start:start + len(batch)] = ranker['model'].predict(ranker['scaler'].transform(batch))
+        return scores
+
+if __name__ == "__main__":
+    # Offline training on the accumulated results store: python model_registry.py [results_db] [models_dir]
+    from results_store import ResultsStore
+
+    results_db = sys.argv[1] if len(sys.argv) > 1 else os.path.join('results', 'results.db')
+    models_dir = sys.argv[2] if len(sys.argv) > 2 else 'models'
+
+    accounts = ResultsStore(results_db).to_frame()
+    if len(accounts) < MIN_TRAINING_SAMPLES:
+        print(f"Only {len(accounts)} accounts in {results_db}; at least {MIN_TRAINING_SAMPLES} are needed to train.")
+        sys.exit(1)
+
+    version = ModelRegistry(models_dir).train(accounts)
+    print(f"Trained ranking model v{version} on {len(accounts)} accounts.")
@@ -0,0 +1,124 @@
+import os
+import re
+import uuid
+from datetime import date, datetime
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency: pip install pyarrow
+    pa = None
+
+# Explicit column types, so nothing is re-inferred when results are read back
+PARQUET_DTYPES = {
+    'username': 'string',
+    'name': 'string',
+    'location': 'string',
+    'country': 'category',
+    'category': 'category',
+    'followers_count': 'int32',
+    'following_count': 'int32',
+    'tweet_count': 'int32',
+    'annual_posts': 'int32',
+    'thread_count': 'int32',
+    'activity_days': 'int16',
+    'like_count': 'int32',
+    'retweet_count': 'int32',
+    'reply_count': 'int32',
+    'quote_count': 'int32',
+    'verified': 'bool',
+    'description': 'string',
+    'engagement_score': 'float32',
+    'intensity_score': 'float32',
+    'ai_rank': 'float32',
+    'topic': 'string'
+}
+
+# Directory levels of the dataset: results/parquet/country=kenya/date=2024-05-01/...
+PARTITION_COLUMNS = ['country', 'date']
+
+def parquet_available() -> bool:
+    return pa is not None
+
+class ParquetStore:
+    """Hive-partitioned Parquet dataset of saved results, by country and save date.
+
+    Reads only touch the requested columns and the partitions and row groups
+    that can match the filters.
+    """
+
+    def __init__(self, path: str = os.path.join('results', 'parquet')):
+        if pa is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self._partitioning = ds.partitioning(
+            pa.schema([('country', pa.string()), ('date', pa.string())]), flavor='hive'
+        )
+
+    def write(self, df: pd.DataFrame, topic: Optional[str] = None, name: Optional[str] = None) -> str:
+        """Append ranked results to the dataset; rows keep their own topic if none is given."""
+        frame = df.reindex(columns=list(PARQUET_DTYPES))
+        if topic is not None:
+            frame['topic'] = topic
+        counts = [column for column, dtype in PARQUET_DTYPES.items() if dtype == 'int32']
+        frame[counts] = frame[counts].fillna(0)
+        frame['activity_days'] = frame['activity_days'].fillna(365)  # Counts cover the full year unless marked
+        frame['verified'] = frame['verified'].fillna(False)
+        frame['country'] = frame['country'].fillna('unknown').str.lower()
+        frame['category'] = frame['category'].str.lower()
+        frame = frame.astype(PARQUET_DTYPES)
+        frame['date'] = date.today().isoformat()
+        frame['saved_at'] = pd.Timestamp.now()
+
+        # One file per partition and save, named after the topic for easy browsing
+        slug = re.sub(r'[^a-z0-9]+', '_', (name or topic or 'results').lower()).strip('_') or 'results'
+        basename = f"{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        pq.write_to_dataset(
+            pa.Table.from_pandas(frame, preserve_index=False),
+            self.path,
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f"{basename}_{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        return self.path
+
+    def read(self, columns: Optional[List[str]] = None, country: Optional[str] = None,
+             category: Optional[str] = None, topic: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None) -> pd.DataFrame:
+        """Load saved results, projecting columns and pushing filters down to the scan.
+
+        Country and date filters prune whole partition directories; category
+        and topic filters skip row groups using Parquet statistics.
+        """
+        if not os.path.isdir(self.path):
+            return pd.DataFrame(columns=columns or list(PARQUET_DTYPES))
+
+        conditions = []
+        if country:
+            conditions.append(ds.field('country') == country.lower())
+        if category:
+            conditions.append(ds.field('category') == category.lower())
+        if topic:
+            conditions.append(ds.field('topic') == topic)
+        if date_from:
+            conditions.append(ds.field('date') >= date_from)
+        if date_to:
+            conditions.append(ds.field('date') <= date_to)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        dataset = ds.dataset(self.path, format='parquet', partitioning=self._partitioning)
+        df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        if 'country' in df.columns:
+            df['country'] = df['country'].astype('category')
+        return df
+
+    def export_csv(self, path_or_buffer, columns: Optional[List[str]] = None, **filters):
+        """Write (a filtered selection of) the saved results as CSV."""
+        return self.read(columns=columns, **filters).to_csv(path_or_buffer, index=False)
@@ -0,0 +1,99 @@
+import sqlite3
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+class ProfileCache:
+    """SQLite-backed TTL cache of per-user timeline statistics."""
+
+    def __init__(self, path: str = os.path.join('cache', 'profiles.db'), ttl: int = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                user_id TEXT PRIMARY KEY,
+                username TEXT,
+                annual_posts INTEGER NOT NULL,
+                thread_count INTEGER,
+                public_metrics TEXT,
+                timeline_metrics TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+        if 'timeline_metrics' not in columns:
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN timeline_metrics TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_fetched_at ON profiles (fetched_at)")
+        self._conn.commit()
+
+    def get(self, user_id) -> Optional[Dict]:
+        """Return the cached profile for a user, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT username, annual_posts, thread_count, public_metrics, fetched_at, timeline_metrics "
+                "FROM profiles WHERE user_id = ?",
+                (str(user_id),)
+            ).fetchone()
+
+        if row is None or time.time() - row[4] > self.ttl:
+            return None
+
+        return {
+            'user_id': str(user_id),
+            'username': row[0],
+            'annual_posts': row[1],
+            'thread_count': row[2],
+            'public_metrics': json.loads(row[3]) if row[3] else {},
+            'timeline_metrics': json.loads(row[5]) if row[5] else {},
+            'fetched_at': row[4]
+        }
+
+    def put(self, user_id, username: str, annual_posts: int,
+            thread_count: Optional[int] = None, public_metrics: Optional[Dict] = None,
+            timeline_metrics: Optional[Dict] = None):
+        """Insert or replace the cached profile for a user."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles "
+                "(user_id, username, annual_posts, thread_count, public_metrics, timeline_metrics, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(user_id), username, annual_posts, thread_count,
+                 json.dumps(public_metrics or {}), json.dumps(timeline_metrics or {}), time.time())
+            )
+            self._conn.commit()
+
+    def invalidate(self, user_id):
+        """Drop a single user so the next lookup refetches it."""
+        with self._lock:
+            self._conn.execute("DELETE FROM profiles WHERE user_id = ?", (str(user_id),))
+            self._conn.commit()
+
+    def evict_expired(self) -> int:
+        """Remove every entry older than the TTL and return how many were dropped."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM profiles WHERE fetched_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """Remove every cached profile."""
+        with self._lock:
+            self._conn.execute("DELETE FROM profiles")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
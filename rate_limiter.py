@@ -0,0 +1,140 @@
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import tweepy
+
+from metrics import RATE_LIMIT_WAIT
+
+# X API v2 routes mapped to the client method that calls them
+ENDPOINT_ROUTES = {
+    '/2/tweets/search/recent': 'search_recent_tweets',
+    '/2/users/:id/tweets': 'get_users_tweets',
+    '/2/users': 'get_users'
+}
+
+class RateLimitScheduler:
+    """Token-bucket scheduler that tracks X API rate limits per endpoint.
+
+    Each endpoint gets its own bucket, sized and refilled from the
+    x-rate-limit-* response headers, so waiting on one endpoint never
+    blocks calls to another.
+    """
+
+    def __init__(self, on_wait: Optional[Callable[[str, float], None]] = None,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep,
+                 window: float = 15 * 60):
+        self.on_wait = on_wait
+        self.window = window  # X API rate limits use 15 minute windows
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint: str) -> Dict:
+        return self._buckets.setdefault(endpoint, {'limit': None, 'remaining': None, 'reset': 0.0})
+
+    def acquire(self, endpoint: str):
+        """Block until a request to the endpoint is allowed, then take a token."""
+        while True:
+            with self._lock:
+                bucket = self._bucket(endpoint)
+                now = self._clock()
+
+                # Window has reset; refill until the next response tells us otherwise
+                if bucket['remaining'] is not None and now >= bucket['reset']:
+                    bucket['remaining'] = bucket['limit']
+                    bucket['reset'] = now + self.window
+
+                if bucket['remaining'] is None:
+                    return
+                if bucket['remaining'] > 0:
+                    bucket['remaining'] -= 1
+                    return
+
+                wait = bucket['reset'] - now
+
+            RATE_LIMIT_WAIT.inc(wait + 1, endpoint=endpoint)
+            if self.on_wait:
+                self.on_wait(endpoint, wait)
+            self._sleep(wait + 1)  # Small margin for clock skew with the API
+
+    def update(self, endpoint: str, headers) -> bool:
+        """Refresh an endpoint's bucket from x-rate-limit-* response headers; False if there were none."""
+        if headers is None:
+            return False
+
+        remaining = headers.get('x-rate-limit-remaining')
+        reset = headers.get('x-rate-limit-reset')
+        if remaining is None or reset is None:
+            return False
+
+        limit = headers.get('x-rate-limit-limit')
+        remaining, reset = int(remaining), float(reset)
+
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            if reset == bucket['reset'] and bucket['remaining'] is not None:
+                # Same window: tokens already taken by in-flight calls stay spent
+                bucket['remaining'] = min(bucket['remaining'], remaining)
+            else:
+                bucket['remaining'] = remaining
+            bucket['reset'] = reset
+            bucket['limit'] = int(limit) if limit is not None else max(bucket['limit'] or 0, remaining)
+        return True
+
+    def defer(self, endpoint: str, seconds: float):
+        """Hold every request to the endpoint for seconds, e.g. after a 429 without rate-limit headers."""
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            hold_until = self._clock() + seconds
+            # An endpoint already out of tokens stays held until its own reset if that is later
+            bucket['reset'] = max(bucket['reset'], hold_until) if bucket['remaining'] == 0 else hold_until
+            bucket['remaining'] = 0
+
+    def wait_time(self, endpoint: str) -> float:
+        """Seconds until the endpoint has a token available."""
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            if bucket['remaining'] is None or bucket['remaining'] > 0:
+                return 0.0
+            return max(0.0, bucket['reset'] - self._clock())
+
+    def max_wait_time(self) -> float:
+        """Longest wait any endpoint currently faces."""
+        with self._lock:
+            endpoints = list(self._buckets)
+        return max((self.wait_time(endpoint) for endpoint in endpoints), default=0.0)
+
+class RateLimitedClient(tweepy.Client):
+    """tweepy.Client that reports every response's rate-limit headers to a scheduler."""
+
+    def __init__(self, *args, scheduler: RateLimitScheduler, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+
+    @classmethod
+    def from_env(cls, scheduler: RateLimitScheduler) -> 'RateLimitedClient':
+        """Client authenticated with the credentials in the environment."""
+        return cls(
+            bearer_token=os.getenv('BEARER_TOKEN'),
+            consumer_key=os.getenv('API_KEY'),
+            consumer_secret=os.getenv('API_KEY_SECRET'),
+            access_token=os.getenv('ACCESS_TOKEN'),
+            access_token_secret=os.getenv('ACCESS_TOKEN_SECRET'),
+            scheduler=scheduler
+        )
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        endpoint = ENDPOINT_ROUTES.get(re.sub(r'(?<!^)/\d+', '/:id', route), route)  # Keeps the /2 version prefix
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.TooManyRequests as e:
+            self.scheduler.update(endpoint, e.response.headers)
+            raise
+
+        self.scheduler.update(endpoint, response.headers)
+        return response
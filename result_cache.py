@@ -0,0 +1,51 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class ResultCache:
+    """In-memory LRU cache of ranked result frames keyed by search, with a TTL."""
+
+    def __init__(self, max_entries: int = 32, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, frame)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional['pd.DataFrame']:
+        """Return the cached frame for a key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, df = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return df
+
+    def put(self, key: str, df: 'pd.DataFrame'):
+        """Store a frame, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.time(), df)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one key, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
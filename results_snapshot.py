@@ -0,0 +1,103 @@
+import os
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+except ImportError:  # Optional dependency: pip install pyarrow
+    pa = None
+
+from results_store import SORT_COLUMNS, ResultsStore
+
+def snapshot_available() -> bool:
+    return pa is not None
+
+def _schema():
+    """Arrow types of the snapshot, one field per stored account column."""
+    return pa.schema([
+        ('username', pa.string()),
+        ('user_id', pa.string()),
+        ('name', pa.string()),
+        ('location', pa.string()),
+        ('country', pa.string()),
+        ('followers_count', pa.int64()),
+        ('following_count', pa.int64()),
+        ('tweet_count', pa.int64()),
+        ('annual_posts', pa.int64()),
+        ('thread_count', pa.int64()),
+        ('activity_days', pa.int64()),
+        ('verified', pa.bool_()),
+        ('description', pa.string()),
+        ('category', pa.string()),
+        ('ai_rank', pa.float64()),
+        ('engagement_score', pa.float64()),
+        ('intensity_score', pa.float64()),
+        ('topic', pa.string()),
+        ('updated_at', pa.float64())
+    ])
+
+class ResultsSnapshot:
+    """Immutable Arrow IPC file of every stored account, memory-mapped by readers.
+
+    Writers replace the file atomically after each save, so API workers
+    share one copy of the results through the page cache and see a new
+    version on their next read without restarting.
+    """
+
+    def __init__(self, path: str = os.path.join('results', 'accounts.arrow')):
+        if pa is None:
+            raise ImportError("Results snapshots require pyarrow (pip install pyarrow)")
+        self.path = path
+        self._table = None
+        self._version = None  # (inode, mtime, size) of the mapped file
+
+    def write(self, store: ResultsStore) -> int:
+        """Rebuild the snapshot from the store and swap it in atomically."""
+        accounts = store.accounts()
+        for account in accounts:
+            account['verified'] = bool(account['verified'])
+        table = pa.Table.from_pylist(accounts, schema=_schema())
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, self.path)  # Readers keep their mapping of the previous file
+        return table.num_rows
+
+    def is_current(self, store: ResultsStore) -> bool:
+        """Whether the snapshot was written after the store's last commit."""
+        try:
+            return os.stat(self.path).st_mtime_ns >= os.stat(store.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+
+    def table(self) -> Optional['pa.Table']:
+        """The current snapshot, remapped when a newer one has been written; None if there is none."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if version != self._version:
+            # Zero-copy: column buffers point straight into the mapped file
+            self._table = ipc.open_file(pa.memory_map(self.path, 'r')).read_all()
+            self._version = version
+        return self._table
+
+    def leaderboard(self, category: str = 'all', sort_by: str = 'ai_rank', limit: int = 10) -> Optional[List[Dict]]:
+        """Top accounts for a category, like ResultsStore.leaderboard; None without a snapshot."""
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+
+        table = self.table()
+        if table is None:
+            return None
+        if category != 'all':
+            table = table.filter(pc.equal(table['category'], category.lower()))
+        indices = pc.sort_indices(table, sort_keys=[(sort_by, 'descending')], null_placement='at_end')
+        return table.take(indices[:limit]).to_pylist()
@@ -0,0 +1,476 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported where needed so read-only API workers skip it
+
+# Columns persisted for every ranked account
+ACCOUNT_COLUMNS = [
+    'username', 'user_id', 'name', 'location', 'country', 'followers_count', 'following_count',
+    'tweet_count', 'annual_posts', 'thread_count', 'activity_days', 'verified', 'description',
+    'category', 'ai_rank', 'engagement_score', 'intensity_score', 'topic', 'updated_at'
+]
+
+# Trend rollup granularities and how a timestamp maps to their bucket
+TREND_PERIODS = {
+    'week': lambda moment: moment.strftime('%G-W%V'),
+    'month': lambda moment: moment.strftime('%Y-%m')
+}
+
+# Columns leaderboards may be sorted by, each backed by an index
+SORT_COLUMNS = [
+    'ai_rank', 'engagement_score', 'intensity_score', 'followers_count',
+    'annual_posts', 'thread_count'
+]
+
+class ResultsStore:
+    """SQLite store of ranked accounts keyed by username.
+
+    Per-category and per-country aggregates are maintained on every upsert,
+    so leaderboard and dashboard queries never scan the saved results.
+    Every upsert also appends a metric snapshot per account and folds it
+    into weekly and monthly trend rollups.
+    """
+
+    def __init__(self, path: str = os.path.join('results', 'results.db')):
+        self.path = path
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+        self._remove_listeners: List[Callable[[List[str]], None]] = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS accounts (
+                username TEXT PRIMARY KEY,
+                user_id TEXT,
+                name TEXT,
+                location TEXT,
+                country TEXT,
+                followers_count INTEGER,
+                following_count INTEGER,
+                tweet_count INTEGER,
+                annual_posts INTEGER,
+                thread_count INTEGER,
+                activity_days INTEGER,
+                verified INTEGER,
+                description TEXT,
+                category TEXT,
+                ai_rank REAL,
+                engagement_score REAL,
+                intensity_score REAL,
+                topic TEXT,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS aggregates (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                account_count INTEGER NOT NULL DEFAULT 0,
+                engagement_sum REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                username TEXT NOT NULL,
+                captured_at REAL NOT NULL,
+                country TEXT,
+                category TEXT,
+                followers_count INTEGER,
+                engagement_score REAL,
+                intensity_score REAL,
+                ai_rank REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshots_username ON snapshots (username, captured_at);
+            CREATE TABLE IF NOT EXISTS trend_rollups (
+                period TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                snapshot_count INTEGER NOT NULL DEFAULT 0,
+                engagement_sum REAL NOT NULL DEFAULT 0,
+                followers_sum INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (period, dimension, value, bucket)
+            );
+            CREATE TABLE IF NOT EXISTS migrated_files (
+                filename TEXT PRIMARY KEY,
+                migrated_at REAL
+            );
+            """
+        )
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(accounts)")}
+        if 'user_id' not in columns:  # Stores created before accounts kept their X user id
+            self._add_column('user_id TEXT')
+        if 'activity_days' not in columns:  # Days the activity counts cover; NULL when saved before it was tracked
+            self._add_column('activity_days INTEGER')
+        for column in SORT_COLUMNS:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_accounts_{column} ON accounts ({column})")
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_accounts_category_{column} ON accounts (category, {column})"
+            )
+        self._conn.commit()
+
+    def _add_column(self, definition: str):
+        """Add a column to accounts, tolerating another process having just added it."""
+        try:
+            self._conn.execute(f"ALTER TABLE accounts ADD COLUMN {definition}")
+        except sqlite3.OperationalError as e:
+            if 'duplicate column' not in str(e):
+                raise
+
+    @contextmanager
+    def _write_transaction(self):
+        """Hold the store for a read-modify-write, across threads and processes.
+
+        BEGIN IMMEDIATE takes SQLite's write lock before the first read, so
+        another process can't read the same old rows in between and both
+        writers subtract the same aggregate contributions.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def add_listener(self, listener: Callable[[List[Dict]], None]):
+        """Call listener with the stored account records after every upsert."""
+        self._listeners.append(listener)
+
+    def add_remove_listener(self, listener: Callable[[List[str]], None]):
+        """Call listener with the usernames deleted by every remove."""
+        self._remove_listeners.append(listener)
+
+    def data_version(self) -> int:
+        """Changes whenever another connection (e.g. a CLI run) commits to the store."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @staticmethod
+    def _aggregate_keys(row) -> List:
+        """Aggregate buckets an account contributes to."""
+        return [('all', 'all'), ('category', row['category']), ('country', row['country'])]
+
+    def upsert(self, df: 'pd.DataFrame', topic: Optional[str] = None,
+               captured_at: Optional[float] = None) -> int:
+        """Insert or update accounts by username and fold them into the aggregates.
+
+        The accounts are also snapshotted as of captured_at (default now) for
+        the engagement trends.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = df.drop_duplicates(subset=['username'], keep='last')
+        now = time.time()
+        records = []
+        for row in df.to_dict('records'):
+            record = {column: row.get(column) for column in ACCOUNT_COLUMNS}
+            record['topic'] = topic if topic is not None else record['topic']
+            record['updated_at'] = now
+            for column, value in record.items():
+                if isinstance(value, float) and value != value:  # NaN
+                    record[column] = None
+                elif hasattr(value, 'item'):  # NumPy scalar
+                    record[column] = value.item()
+            if record['category']:
+                record['category'] = str(record['category']).lower()
+            if record['country']:
+                record['country'] = str(record['country']).lower()
+            record['verified'] = int(bool(record['verified']))
+            records.append(record)
+
+        counts = Counter()
+        engagement = Counter()
+
+        # Snapshot rollups only ever grow, so they are plain increments
+        captured_at = captured_at or now
+        moment = datetime.fromtimestamp(captured_at)
+        buckets = [(period, bucket(moment)) for period, bucket in TREND_PERIODS.items()]
+        trend_counts = Counter()
+        trend_engagement = Counter()
+        trend_followers = Counter()
+        for record in records:
+            for period, bucket in buckets:
+                for dimension, value in self._aggregate_keys(record):
+                    key = (period, bucket, dimension, value or 'unknown')
+                    trend_counts[key] += 1
+                    trend_engagement[key] += record['engagement_score'] or 0.0
+                    trend_followers[key] += record['followers_count'] or 0
+
+        with self._write_transaction():
+            # Remove the previous contribution of accounts being replaced
+            usernames = [record['username'] for record in records]
+            for start in range(0, len(usernames), 500):
+                chunk = usernames[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for old in self._conn.execute(
+                    f"SELECT category, country, engagement_score FROM accounts WHERE username IN ({placeholders})",
+                    chunk
+                ):
+                    for key in self._aggregate_keys(old):
+                        counts[key] -= 1
+                        engagement[key] -= old['engagement_score'] or 0.0
+
+            for record in records:
+                for key in self._aggregate_keys(record):
+                    counts[key] += 1
+                    engagement[key] += record['engagement_score'] or 0.0
+
+            placeholders = ','.join('?' * len(ACCOUNT_COLUMNS))
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO accounts ({', '.join(ACCOUNT_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(record[column] for column in ACCOUNT_COLUMNS) for record in records]
+            )
+            self._conn.executemany(
+                "INSERT INTO aggregates (dimension, value, account_count, engagement_sum) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (dimension, value) DO UPDATE SET "
+                "account_count = account_count + excluded.account_count, "
+                "engagement_sum = engagement_sum + excluded.engagement_sum",
+                [(dimension, value or 'unknown', counts[(dimension, value)], engagement[(dimension, value)])
+                 for dimension, value in counts]
+            )
+            self._conn.executemany(
+                "INSERT INTO snapshots (username, captured_at, country, category, followers_count, "
+                "engagement_score, intensity_score, ai_rank) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(record['username'], captured_at, record['country'], record['category'],
+                  record['followers_count'], record['engagement_score'], record['intensity_score'],
+                  record['ai_rank']) for record in records]
+            )
+            self._conn.executemany(
+                "INSERT INTO trend_rollups (period, bucket, dimension, value, snapshot_count, engagement_sum, "
+                "followers_sum) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (period, dimension, value, bucket) DO UPDATE SET "
+                "snapshot_count = snapshot_count + excluded.snapshot_count, "
+                "engagement_sum = engagement_sum + excluded.engagement_sum, "
+                "followers_sum = followers_sum + excluded.followers_sum",
+                [(*key, trend_counts[key], trend_engagement[key], trend_followers[key]) for key in trend_counts]
+            )
+
+        for listener in self._listeners:
+            listener(records)
+        return len(records)
+
+    def remove(self, usernames: List[str]) -> int:
+        """Delete accounts and take them out of the aggregates; their trend snapshots are history and stay."""
+        usernames = list(dict.fromkeys(usernames))
+        if not usernames:
+            return 0
+
+        counts = Counter()
+        engagement = Counter()
+        removed = []
+        with self._write_transaction():
+            for start in range(0, len(usernames), 500):
+                chunk = usernames[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for old in self._conn.execute(
+                    f"SELECT username, category, country, engagement_score FROM accounts "
+                    f"WHERE username IN ({placeholders})",
+                    chunk
+                ):
+                    removed.append(old['username'])
+                    for key in self._aggregate_keys(old):
+                        counts[key] -= 1
+                        engagement[key] -= old['engagement_score'] or 0.0
+
+            self._conn.executemany("DELETE FROM accounts WHERE username = ?", [(username,) for username in removed])
+            self._conn.executemany(
+                "UPDATE aggregates SET account_count = account_count + ?, engagement_sum = engagement_sum + ? "
+                "WHERE dimension = ? AND value = ?",
+                [(counts[key], engagement[key], key[0], key[1] or 'unknown') for key in counts]
+            )
+
+        for listener in self._remove_listeners:
+            listener(removed)
+        return len(removed)
+
+    def leaderboard(self, category: str = 'all', sort_by: str = 'ai_rank', limit: int = 10) -> List[Dict]:
+        """Top accounts for a category, ordered by an indexed column."""
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+
+        query = "SELECT * FROM accounts"
+        params = []
+        if category != 'all':
+            query += " WHERE category = ?"
+            params.append(category.lower())
+        query += f" ORDER BY {sort_by} DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        accounts = [dict(row) for row in rows]
+        for account in accounts:
+            account['verified'] = bool(account['verified'])
+        return accounts
+
+    def stats(self) -> Dict:
+        """Dashboard totals read straight from the aggregates table."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dimension, value, account_count, engagement_sum FROM aggregates WHERE account_count > 0"
+            ).fetchall()
+
+        totals = {'account_count': 0, 'engagement_sum': 0.0}
+        categories = {}
+        countries = {}
+        for row in rows:
+            if row['dimension'] == 'all':
+                totals = dict(row)
+            elif row['dimension'] == 'category':
+                categories[row['value']] = row['account_count']
+            elif row['dimension'] == 'country':
+                countries[row['value']] = row['account_count']
+
+        total = totals['account_count']
+        return {
+            'total_influencers': total,
+            'average_engagement': totals['engagement_sum'] / total if total else 0.0,
+            'active_countries': len([country for country in countries if country != 'unknown']),
+            'category_distribution': categories,
+            'country_distribution': countries
+        }
+
+    def trends(self, period: str = 'month', dimension: str = 'all', value: str = 'all',
+               limit: int = 6) -> Dict:
+        """Average engagement and followers per week or month, oldest bucket first.
+
+        dimension is 'all', 'country' or 'category'; reads only the rollups.
+        """
+        if period not in TREND_PERIODS:
+            raise ValueError(f"Unknown trend period '{period}'")
+        if dimension not in ('all', 'country', 'category'):
+            raise ValueError(f"Unknown trend dimension '{dimension}'")
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, snapshot_count, engagement_sum, followers_sum FROM trend_rollups "
+                "WHERE period = ? AND dimension = ? AND value = ? ORDER BY bucket DESC LIMIT ?",
+                (period, dimension, value.lower(), limit)
+            ).fetchall()
+
+        rows = rows[::-1]
+        return {
+            'labels': [row['bucket'] for row in rows],
+            'data': [row['engagement_sum'] / row['snapshot_count'] for row in rows],
+            'average_followers': [row['followers_sum'] / row['snapshot_count'] for row in rows],
+            'snapshots': [row['snapshot_count'] for row in rows]
+        }
+
+    def migrate_csv_dir(self, results_dir: str = 'results') -> int:
+        """Import saved CSV results once each, oldest first so newer files win.
+
+        Each file is claimed in migrated_files before it is imported, so API
+        workers starting together never import the same file twice.
+        """
+        if not os.path.isdir(results_dir):
+            return 0
+
+        with self._lock:
+            done = {row[0] for row in self._conn.execute("SELECT filename FROM migrated_files")}
+
+        paths = [
+            os.path.join(results_dir, file) for file in os.listdir(results_dir)
+            if file.endswith('.csv') and file not in done
+        ]
+        if not paths:
+            return 0
+
+        import pandas as pd
+        imported = 0
+        for path in sorted(paths, key=os.path.getmtime):
+            # Saved files are named <topic>_<YYYYmmdd>_<HHMMSS>.csv; batch files carry a topic column
+            if not self._claim(path):
+                continue  # Another process is importing or has imported it
+            try:
+                df = pd.read_csv(path)
+                topic = None if 'topic' in df.columns else (
+                    ' '.join(os.path.basename(path)[:-len('.csv')].split('_')[:-2]) or None
+                )
+                imported += self.upsert(df, topic=topic, captured_at=os.path.getmtime(path))
+            except BaseException:
+                self._unclaim(path)  # Let a later start retry the file
+                raise
+
+        return imported
+
+    def _claim(self, path: str) -> bool:
+        """Mark a results CSV as migrated unless another connection already has; True if this one did."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO migrated_files (filename, migrated_at) VALUES (?, ?)",
+                (os.path.basename(path), time.time())
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def _unclaim(self, path: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM migrated_files WHERE filename = ?", (os.path.basename(path),))
+            self._conn.commit()
+
+    def mark_migrated(self, path: str):
+        """Record a results CSV as already in the store so migration skips it."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO migrated_files (filename, migrated_at) VALUES (?, ?)",
+                (os.path.basename(path), time.time())
+            )
+            self._conn.commit()
+
+    def accounts(self, usernames: Optional[List[str]] = None) -> List[Dict]:
+        """Stored account records, all of them or those with the given usernames."""
+        with self._lock:
+            if usernames is None:
+                rows = self._conn.execute("SELECT * FROM accounts").fetchall()
+            else:
+                rows = []
+                for start in range(0, len(usernames), 500):
+                    chunk = list(usernames[start:start + 500])
+                    rows += self._conn.execute(
+                        f"SELECT * FROM accounts WHERE username IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_stored(self, usernames: List[str]) -> int:
+        """How many of the given usernames are already stored."""
+        usernames = list(set(usernames))
+        count = 0
+        with self._lock:
+            for start in range(0, len(usernames), 500):
+                chunk = usernames[start:start + 500]
+                count += self._conn.execute(
+                    f"SELECT COUNT(*) FROM accounts WHERE username IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchone()[0]
+        return count
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> 'pd.DataFrame':
+        """Load stored accounts (optionally only some columns) into a DataFrame."""
+        import pandas as pd
+        columns = columns or ACCOUNT_COLUMNS
+        with self._lock:
+            return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM accounts", self._conn)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+if __name__ == "__main__":
+    # One-shot import of existing CSV results: python results_store.py [results_dir]
+    results_dir = sys.argv[1] if len(sys.argv) > 1 else 'results'
+    store = ResultsStore(os.path.join(results_dir, 'results.db'))
+    print(f"Imported {store.migrate_csv_dir(results_dir)} accounts into {store.path}")
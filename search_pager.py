@@ -0,0 +1,69 @@
+import time
+from typing import Callable, Iterator, Optional
+
+class SearchPager:
+    """Iterate recent-search result pages, following next_token within a page budget.
+
+    Each page is fetched with the previous page's next_token, so no page is
+    requested twice. Iteration stops when the budget is spent or the API
+    stops returning a token. Pages whose tweets were already seen are counted
+    and skipped rather than re-processed.
+    """
+
+    def __init__(self, fetch_page: Callable[[Optional[str]], object], max_pages: int,
+                 next_token: Optional[str] = None, pages_done: int = 0,
+                 retries: int = 3, backoff: float = 2.0,
+                 on_retry: Optional[Callable[[int, Exception, float], None]] = None):
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self.next_token = next_token
+        self.pages = pages_done  # Pages consumed, including any before a resume
+        self.retries = retries
+        self.backoff = backoff
+        self.on_retry = on_retry
+
+        # A resumed crawl without a token has already run out of results
+        self.exhausted = pages_done > 0 and not next_token
+        self.requests = 0
+        self.duplicate_pages = 0
+        self.elapsed = 0.0
+        self._seen_pages = set()
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def _fetch(self):
+        """Fetch the next page, retrying failures with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return self.fetch_page(self.next_token)
+            except Exception as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                delay = self.backoff * 2 ** (attempt - 1)
+                if self.on_retry:
+                    self.on_retry(self.pages + 1, e, delay)
+                time.sleep(delay)
+
+    def __iter__(self) -> Iterator:
+        while self.pages < self.max_pages and not self.exhausted:
+            start = time.perf_counter()
+            response = self._fetch()
+            self.elapsed += time.perf_counter() - start
+            self.requests += 1
+            self.pages += 1
+
+            token = (response.meta or {}).get('next_token')
+            self.exhausted = not token or token == self.next_token or not response.data
+            self.next_token = token
+
+            fingerprint = frozenset(tweet.id for tweet in response.data or [])
+            if fingerprint and fingerprint in self._seen_pages:
+                self.duplicate_pages += 1
+                continue
+            self._seen_pages.add(fingerprint)
+
+            yield response
@@ -0,0 +1,86 @@
+import gzip
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: pip install orjson
+    orjson = None
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Fastest level: most of the size win of higher levels at a fraction of their time
+GZIP_LEVEL = 1
+
+def dumps(obj: Any) -> bytes:
+    """Encode plain Python data as JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), allow_nan=False).encode()
+
+def _column_values(series: 'pd.Series', annotation: type) -> List:
+    """Check one column against a schema type and convert it to plain Python values."""
+    import numpy as np
+    import pandas as pd
+    from pandas.api import types
+
+    name = series.name
+    if series.isna().any():
+        raise ValueError(f"Column '{name}' has missing values")
+
+    if annotation is str:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        if types.infer_dtype(series, skipna=False) != 'string':
+            raise ValueError(f"Column '{name}' must hold strings")
+    elif annotation is bool:
+        if types.is_integer_dtype(series) and series.isin([0, 1]).all():
+            series = series.astype(bool)  # SQLite stores booleans as 0/1
+        elif not types.is_bool_dtype(series):
+            raise ValueError(f"Column '{name}' must hold booleans")
+    elif annotation is int:
+        if types.is_float_dtype(series) and (series % 1 == 0).all():
+            series = series.astype('int64')
+        elif not types.is_integer_dtype(series) or types.is_bool_dtype(series):
+            raise ValueError(f"Column '{name}' must hold integers")
+    elif annotation is float:
+        if not types.is_numeric_dtype(series) or types.is_bool_dtype(series):
+            raise ValueError(f"Column '{name}' must hold numbers")
+        series = series.astype('float64')
+        if not np.isfinite(series.to_numpy()).all():
+            raise ValueError(f"Column '{name}' has infinite values")
+    else:
+        raise TypeError(f"Unsupported schema type {annotation!r} for column '{name}'")
+
+    return series.tolist()  # One C-level conversion per column to Python scalars
+
+def frame_records(df: 'pd.DataFrame', schema: Dict[str, type]) -> List[Dict]:
+    """Validate a frame column by column against a schema and return its rows as plain dicts.
+
+    schema maps each output field to str, int, float or bool (e.g. the field
+    annotations of a Pydantic model). Every column is checked and converted
+    in one vectorized step, so no per-row model objects are built.
+    """
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    fields = list(schema)
+    columns = [_column_values(df[field], annotation) for field, annotation in schema.items()]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+def will_compress(body: bytes, accept_encoding: Optional[str] = None) -> bool:
+    """Whether compress would gzip this body for this Accept-Encoding, without compressing it."""
+    return bool(accept_encoding) and 'gzip' in accept_encoding and len(body) >= GZIP_MIN_SIZE
+
+def compress(body: bytes, accept_encoding: Optional[str] = None) -> Tuple[bytes, Dict[str, str]]:
+    """Gzip a response body when the client accepts it and it is large enough; returns it with its headers."""
+    headers = {'Vary': 'Accept-Encoding'}
+    if will_compress(body, accept_encoding):
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers['Content-Encoding'] = 'gzip'
+    return body, headers
@@ -0,0 +1,145 @@
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Fixed column types of the account buffer; strings stay Python objects
+ACCOUNT_DTYPES = {
+    'username': object,
+    'user_id': object,
+    'name': object,
+    'location': object,
+    'country': object,
+    'description': object,
+    'followers_count': np.int64,
+    'following_count': np.int64,
+    'tweet_count': np.int64,
+    'annual_posts': np.int64,
+    'thread_count': np.int64,
+    'activity_days': np.int64,
+    'like_count': np.int64,
+    'retweet_count': np.int64,
+    'reply_count': np.int64,
+    'quote_count': np.int64,
+    'verified': np.bool_
+}
+
+class AccountBuffer:
+    """Fixed-capacity columnar buffer of accepted accounts.
+
+    Each column is a preallocated array of its ACCOUNT_DTYPES type that is
+    reused after every flush, so no per-account dicts are kept around.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._columns = {column: np.zeros(capacity, dtype=dtype) for column, dtype in ACCOUNT_DTYPES.items()}
+        self._size = 0
+
+    def append(self, account: Dict):
+        if self.full:
+            raise OverflowError("Account buffer is full; flush it first")
+        for column, values in self._columns.items():
+            value = account.get(column)
+            values[self._size] = value if value is not None else values.dtype.type()
+        self._size += 1
+
+    @property
+    def full(self) -> bool:
+        return self._size >= self.capacity
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy the buffered accounts into a typed frame."""
+        return pd.DataFrame({column: values[:self._size].copy() for column, values in self._columns.items()})
+
+    def clear(self):
+        for values in self._columns.values():
+            if values.dtype == object:
+                values[:self._size] = None  # Release the buffered strings
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+class StreamingRanker:
+    """Ranks accounts in fixed-size chunks as they arrive, keeping only the top N per category.
+
+    Memory holds at most one buffer chunk plus top_n rows per category,
+    however many accounts are added. Every scored chunk is passed to
+    on_chunk so callers can persist it in full.
+    """
+
+    def __init__(self, score_chunk: Callable[[pd.DataFrame], pd.DataFrame], top_n: int = 100,
+                 chunk_size: int = 4096, on_chunk: Optional[Callable[[pd.DataFrame], None]] = None):
+        self.score_chunk = score_chunk
+        self.top_n = top_n
+        self.on_chunk = on_chunk
+        self.buffer = AccountBuffer(chunk_size)
+        self.accepted = 0
+        self.chunks_scored = 0
+        self._columns: Optional[List[str]] = None
+        self._heaps: Dict[str, List] = {}  # category -> min-heap of (ai_rank, sequence, row)
+        self._sequence = itertools.count()  # Tie-breaker so rows are never compared
+
+    def add(self, account: Dict):
+        self.buffer.append(account)
+        self.accepted += 1
+        if self.buffer.full:
+            self.flush()
+
+    def _push(self, category: str, row: tuple):
+        heap = self._heaps.setdefault(category, [])
+        item = (row[self._columns.index('ai_rank')], next(self._sequence), row)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def flush(self):
+        """Score the buffered chunk and fold it into the per-category top N."""
+        if not len(self.buffer):
+            return
+
+        ranked = self.score_chunk(self.buffer.to_frame())
+        self.buffer.clear()
+        self.chunks_scored += 1
+        if self.on_chunk is not None:
+            self.on_chunk(ranked)
+
+        self._columns = self._columns or list(ranked.columns)
+        ranked = ranked[self._columns]
+        for category, group in ranked.groupby('category', sort=False):
+            # Only a chunk's own top N can make it into the running top N
+            for row in group.nlargest(self.top_n, 'ai_rank').itertuples(index=False, name=None):
+                self._push(category, row)
+
+    def result(self) -> pd.DataFrame:
+        """Top accounts of every category, best ranked first."""
+        self.flush()
+        rows = [row for heap in self._heaps.values() for _, _, row in heap]
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, columns=self._columns).sort_values('ai_rank', ascending=False)
+
+    def state(self) -> Dict:
+        """JSON-serializable snapshot for checkpoints, bounded like the ranker itself."""
+        def plain(row):
+            return [value.item() if hasattr(value, 'item') else value for value in row]
+
+        return {
+            'accepted': self.accepted,
+            'columns': self._columns,
+            'top': [plain(row) for heap in self._heaps.values() for _, _, row in heap],
+            'pending': self.buffer.to_frame().to_dict('records')
+        }
+
+    def restore(self, state: Dict):
+        """Reload a snapshot taken by state()."""
+        self._columns = state['columns']
+        for row in state['top']:
+            self._push(row[self._columns.index('category')], tuple(row))
+        for account in state['pending']:
+            self.add(account)
+        self.accepted = state['accepted']
@@ -0,0 +1,100 @@
+import tweepy
+
+from checkpoint import CheckpointStore
+from test_timeline import TimelineClient, make_analyzer
+
+class SearchClient(TimelineClient):
+    """Search pages each bringing one new Kenyan author and a repeat London author.
+
+    Every author posts 400 original tweets a year, so every Kenyan qualifies.
+    The page at index fail_on keeps failing until fail_on is cleared.
+    """
+
+    def __init__(self, pages: int, fail_on=None):
+        super().__init__(posts=400, spacing=10)
+        self.pages = pages
+        self.fail_on = fail_on
+        self.searches = 0
+
+    @staticmethod
+    def author(n: int, location: str) -> tweepy.User:
+        return tweepy.User({
+            'id': str(1000 + n), 'username': f'user{n}', 'name': f'User {n}', 'location': location,
+            'description': 'tech', 'verified': False,
+            'public_metrics': {'followers_count': 5000, 'following_count': 10, 'tweet_count': 5000}
+        })
+
+    def search_recent_tweets(self, query, next_token=None, **kwargs):
+        page = int(next_token or 0)
+        if page == self.fail_on:
+            raise ConnectionError('search unavailable')
+        self.searches += 1
+        users = [self.author(page, 'Nairobi, Kenya'), self.author(999, 'London')]
+        data = [
+            tweepy.Tweet({
+                'id': str(page * 10 + n), 'text': 'post', 'author_id': str(user.id),
+                'public_metrics': {'like_count': 5, 'retweet_count': 1, 'reply_count': 1, 'quote_count': 0}
+            })
+            for n, user in enumerate(users)
+        ]
+        meta = {'result_count': len(data)}
+        if page + 1 < self.pages:
+            meta['next_token'] = str(page + 1)
+        return tweepy.Response(data, {'users': users}, [], meta)
+
+def make_crawler(tmp_path, client):
+    analyzer = make_analyzer(tmp_path, client)
+    analyzer.page_retries = 0
+    analyzer.checkpoint_every = 1
+    return analyzer
+
+def test_failed_crawl_resumes_from_its_checkpoint(tmp_path):
+    client = SearchClient(pages=5, fail_on=3)
+    analyzer = make_crawler(tmp_path, client)
+
+    df = analyzer.analyze_accounts('ai tools', max_pages=5)
+    assert sorted(df['username']) == ['user0', 'user1', 'user2']
+    assert analyzer.last_run_stats['interrupted'] == 1
+    assert analyzer.checkpoints.load('ai tools', 5)['page_count'] == 3
+
+    client.fail_on = None
+    df = analyzer.analyze_accounts('ai tools', max_pages=5)
+    assert sorted(df['username']) == ['user0', 'user1', 'user2', 'user3', 'user4']
+    assert 'interrupted' not in analyzer.last_run_stats
+    assert client.searches == 5  # Pages fetched before the failure were not fetched again
+    assert analyzer.last_run_stats['duplicate_authors_skipped'] == 4  # The London author's repeats
+    assert analyzer.checkpoints.load('ai tools', 5) is None
+
+def test_streaming_checkpoint_resumes_in_full_mode(tmp_path):
+    client = SearchClient(pages=5, fail_on=3)
+    analyzer = make_crawler(tmp_path, client)
+    analyzer.stream_chunk_size = 2
+
+    analyzer.analyze_accounts('ai tools', max_pages=5, stream_top_n=10)
+    stream = analyzer.checkpoints.load('ai tools', 5)['stream']
+    assert len(stream['top']) == 2 and len(stream['pending']) == 1  # One scored chunk, one account buffered
+
+    client.fail_on = None
+    df = analyzer.analyze_accounts('ai tools', max_pages=5)
+    assert sorted(df['username']) == ['user0', 'user1', 'user2', 'user3', 'user4']
+    assert df['ai_rank'].notna().all()
+
+def test_resume_can_be_skipped(tmp_path):
+    client = SearchClient(pages=3, fail_on=2)
+    analyzer = make_crawler(tmp_path, client)
+    analyzer.analyze_accounts('ai tools', max_pages=3)
+
+    client.fail_on = None
+    df = analyzer.analyze_accounts('ai tools', max_pages=3, resume=False)
+    assert sorted(df['username']) == ['user0', 'user1', 'user2']
+    assert client.searches == 2 + 3
+
+def test_checkpoints_are_kept_per_topic_and_page_budget(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path))
+    checkpoints.save('AI  Tools', 5, {'page_count': 2})
+    assert checkpoints.load('ai tools', 5)['page_count'] == 2
+    assert checkpoints.load('ai tools', 10) is None
+
+    checkpoints.clear('ai tools', 5)
+    assert checkpoints.load('ai tools', 5) is None
+    assert list(tmp_path.iterdir()) == []
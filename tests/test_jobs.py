@@ -0,0 +1,48 @@
+import pandas as pd
+
+from jobs import JobManager
+
+class StubAnalyzer:
+    """Returns a one-account ranking per topic, reporting the crawl as cut short when asked."""
+
+    def __init__(self, interrupted: bool = False):
+        self.interrupted = interrupted
+        self.runs = 0
+
+    def analyze_accounts(self, topic, max_pages=25, on_progress=None, stream_top_n=None):
+        self.runs += 1
+        on_progress({'type': 'progress', 'stage': 'ranking', 'interrupted': self.interrupted})
+        return pd.DataFrame({'username': [f'{topic}_user'], 'ai_rank': [0.5]})
+
+def test_submit_returns_finished_job_from_cache():
+    analyzer = StubAnalyzer()
+    jobs = JobManager(analyzer)
+    try:
+        first = jobs.submit('AI tools', max_pages=3)
+        first.future.result(timeout=5)
+
+        second = jobs.submit('ai  TOOLS', max_pages=3)
+        assert second is not first
+        assert second.status == 'done'
+        assert second.future.result(timeout=0) is first.result
+        assert second.events[-1]['cached']
+        assert analyzer.runs == 1
+
+        jobs.submit('AI tools', max_pages=3, refresh=True).future.result(timeout=5)
+        assert analyzer.runs == 2
+    finally:
+        jobs.shutdown()
+
+def test_interrupted_crawl_is_not_cached():
+    analyzer = StubAnalyzer(interrupted=True)
+    jobs = JobManager(analyzer)
+    try:
+        job = jobs.submit('AI tools', max_pages=3)
+        assert len(job.future.result(timeout=5)) == 1
+        assert job.status == 'done'
+        assert jobs.cached_result('AI tools', max_pages=3) is None
+
+        jobs.submit('AI tools', max_pages=3).future.result(timeout=5)
+        assert analyzer.runs == 2
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from leaderboard_views import LeaderboardViews
+from results_store import ResultsStore
+
+def accounts(*rows) -> pd.DataFrame:
+    """Accounts from (username, category, ai_rank) tuples."""
+    return pd.DataFrame([
+        {'username': username, 'category': category, 'country': 'kenya', 'ai_rank': rank,
+         'engagement_score': rank, 'followers_count': 1000, 'verified': False}
+        for username, category, rank in rows
+    ])
+
+def ranked(views: LeaderboardViews, category: str = 'all', limit: int = 3):
+    return [(account['username'], account['ai_rank']) for account in views.get(category, 'ai_rank', limit)[0]]
+
+def make_views(tmp_path, size: int = 3):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    views = LeaderboardViews(store, size=size)
+    return store, views
+
+def test_upserts_merge_into_the_views_they_touch(tmp_path):
+    store, views = make_views(tmp_path)
+    store.upsert(accounts(('a', 'nano', 0.9), ('b', 'nano', 0.5), ('c', 'micro', 0.7)))
+    views.build()
+    _, etag = views.get('nano', 'ai_rank', 3)
+
+    store.upsert(accounts(('d', 'nano', 0.6), ('a', 'nano', 0.95)))
+    assert ranked(views) == [('a', 0.95), ('c', 0.7), ('d', 0.6)]
+    assert ranked(views, 'nano') == [('a', 0.95), ('d', 0.6), ('b', 0.5)]
+    assert ranked(views, 'micro') == [('c', 0.7)]
+    assert views.get('nano', 'ai_rank', 3)[1] != etag
+
+def test_category_change_moves_an_account_between_views(tmp_path):
+    store, views = make_views(tmp_path)
+    store.upsert(accounts(('a', 'nano', 0.9), ('b', 'micro', 0.5)))
+    views.build()
+
+    store.upsert(accounts(('a', 'micro', 0.9)))
+    assert ranked(views, 'nano') == []
+    assert ranked(views, 'micro') == [('a', 0.9), ('b', 0.5)]
+
+def test_member_falling_within_a_full_view_reloads_it_from_the_store(tmp_path):
+    store, views = make_views(tmp_path)
+    store.upsert(accounts(('a', 'nano', 0.9), ('b', 'nano', 0.8), ('c', 'nano', 0.7), ('d', 'nano', 0.6)))
+    views.build()
+    assert ranked(views) == [('a', 0.9), ('b', 0.8), ('c', 0.7)]
+
+    # 'a' now ranks below 'd', which only the store still knows about
+    store.upsert(accounts(('a', 'nano', 0.1)))
+    assert ranked(views) == [('b', 0.8), ('c', 0.7), ('d', 0.6)]
+
+def test_removed_accounts_leave_the_views(tmp_path):
+    store, views = make_views(tmp_path)
+    store.upsert(accounts(('a', 'nano', 0.9), ('b', 'nano', 0.8), ('c', 'nano', 0.7), ('d', 'nano', 0.6)))
+    views.build()
+
+    store.remove(['b'])
+    assert ranked(views) == [('a', 0.9), ('c', 0.7), ('d', 0.6)]
+    assert ranked(views, 'nano') == [('a', 0.9), ('c', 0.7), ('d', 0.6)]
+
+def test_commits_from_another_connection_rebuild_the_views(tmp_path):
+    store, views = make_views(tmp_path)
+    store.upsert(accounts(('a', 'nano', 0.9)))
+    views.build()
+
+    ResultsStore(store.path).upsert(accounts(('b', 'nano', 0.95)))
+    assert ranked(views) == [('b', 0.95), ('a', 0.9)]
+
+def test_limits_deeper_than_the_views_read_the_store(tmp_path):
+    store, views = make_views(tmp_path, size=2)
+    store.upsert(accounts(('a', 'nano', 0.9), ('b', 'nano', 0.8), ('c', 'nano', 0.7)))
+    views.build()
+    assert ranked(views, limit=5) == [('a', 0.9), ('b', 0.8), ('c', 0.7)]
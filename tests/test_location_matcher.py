@@ -0,0 +1,19 @@
+import pytest
+
+from benchmarks.bench_location import CORPUS
+from criteria import EAST_AFRICAN_LOCATIONS
+from location_matcher import LocationMatcher
+
+@pytest.fixture(scope='module')
+def matcher():
+    return LocationMatcher(EAST_AFRICAN_LOCATIONS)
+
+@pytest.mark.parametrize('location, expected', CORPUS)
+def test_corpus(matcher, location, expected):
+    assert matcher.match(location) == (bool(expected), expected)
+
+def test_lookups_are_memoized_on_the_normalized_location():
+    matcher = LocationMatcher(EAST_AFRICAN_LOCATIONS)
+    assert matcher.match('Nairobi, Kenya') == matcher.match('  nairobi,   KENYA ') == (True, 'kenya')
+    info = matcher.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
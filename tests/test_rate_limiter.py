@@ -0,0 +1,140 @@
+import pytest
+import requests
+import tweepy
+
+from clients import RecordingClient, ReplayClient
+from metrics import RATE_LIMIT_WAIT
+from rate_limiter import RateLimitScheduler, RateLimitedClient
+from x_analyzer import XAnalyzer
+
+class FakeClock:
+    """Clock whose sleeps only move time forward."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def too_many_requests(headers=None) -> tweepy.TooManyRequests:
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = 'Too Many Requests'
+    response.headers.update(headers or {})
+    return tweepy.TooManyRequests(response)
+
+class StubClient:
+    """Answers get_users with one user, after failing the first `failures` calls with a 429."""
+
+    def __init__(self, failures: int = 0, headers=None):
+        self.failures = failures
+        self.headers = headers
+        self.calls = 0
+
+    def get_users(self, ids=None, usernames=None, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise too_many_requests(self.headers)
+        return tweepy.Response([tweepy.User({'id': '1', 'name': 'One', 'username': 'one'})], {}, [], {})
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def scheduler(clock):
+    return RateLimitScheduler(clock=clock, sleep=clock.sleep)
+
+def make_analyzer(tmp_path, client, scheduler) -> XAnalyzer:
+    return XAnalyzer(
+        cache_path=str(tmp_path / 'profiles.db'), client=client, results_dir=str(tmp_path / 'results'),
+        model_dir=str(tmp_path / 'models'), checkpoint_dir=str(tmp_path / 'checkpoints'), scheduler=scheduler
+    )
+
+def test_unknown_endpoint_is_not_limited(scheduler, clock):
+    for _ in range(100):
+        scheduler.acquire('get_users')
+    assert clock.sleeps == []
+
+def test_exhausted_endpoint_waits_for_reset(scheduler, clock):
+    waits = []
+    scheduler.on_wait = lambda endpoint, seconds: waits.append((endpoint, seconds))
+    assert scheduler.update('get_users', {
+        'x-rate-limit-limit': '2', 'x-rate-limit-remaining': '1', 'x-rate-limit-reset': str(clock.now + 60)
+    })
+
+    scheduler.acquire('get_users')
+    assert clock.sleeps == []
+    waited_before = RATE_LIMIT_WAIT.values().get((('endpoint', 'get_users'),), 0)
+    scheduler.acquire('get_users')
+    assert waits == [('get_users', 60)]
+    assert clock.sleeps == [61]
+    assert RATE_LIMIT_WAIT.values()[(('endpoint', 'get_users'),)] == waited_before + 61
+
+def test_same_window_update_keeps_spent_tokens(scheduler, clock):
+    headers = {'x-rate-limit-limit': '10', 'x-rate-limit-remaining': '5', 'x-rate-limit-reset': str(clock.now + 60)}
+    scheduler.update('search_recent_tweets', headers)
+    scheduler.acquire('search_recent_tweets')
+    scheduler.acquire('search_recent_tweets')
+    scheduler.update('search_recent_tweets', dict(headers, **{'x-rate-limit-remaining': '4'}))
+    assert scheduler._buckets['search_recent_tweets']['remaining'] == 3
+
+def test_update_without_headers_is_reported(scheduler):
+    assert not scheduler.update('get_users', {})
+    assert not scheduler.update('get_users', None)
+
+def test_defer_holds_only_its_endpoint(scheduler, clock):
+    scheduler.defer('get_users', 10)
+    scheduler.acquire('get_users_tweets')
+    assert clock.sleeps == []
+    scheduler.acquire('get_users')
+    assert clock.sleeps == [11]
+    scheduler.acquire('get_users')  # No limit known, so none applies once the hold is over
+    assert clock.sleeps == [11]
+
+def test_client_reports_headers_per_endpoint(monkeypatch, scheduler, clock):
+    response = requests.Response()
+    response.headers.update({
+        'x-rate-limit-limit': '900', 'x-rate-limit-remaining': '899', 'x-rate-limit-reset': str(clock.now + 900)
+    })
+    monkeypatch.setattr(tweepy.Client, 'request', lambda self, *args, **kwargs: response)
+
+    client = RateLimitedClient(bearer_token='token', scheduler=scheduler)
+    client.request('GET', '/2/users/12345/tweets')
+    assert scheduler._buckets['get_users_tweets']['remaining'] == 899
+
+def test_rate_limited_call_is_retried_after_reset(tmp_path, scheduler, clock):
+    client = StubClient(failures=1, headers={
+        'x-rate-limit-limit': '900', 'x-rate-limit-remaining': '0', 'x-rate-limit-reset': str(clock.now + 30)
+    })
+    analyzer = make_analyzer(tmp_path, client, scheduler)
+
+    response = analyzer._scheduled(client.get_users)(ids=['1'])
+    assert response.data[0].username == 'one'
+    assert client.calls == 2
+    assert clock.sleeps == [31]
+
+def test_rate_limited_call_without_headers_backs_off_and_gives_up(tmp_path, scheduler, clock):
+    client = StubClient(failures=100)
+    analyzer = make_analyzer(tmp_path, client, scheduler)
+    analyzer.rate_limit_retries = 3
+
+    with pytest.raises(tweepy.TooManyRequests):
+        analyzer._scheduled(client.get_users)(ids=['1'])
+    assert client.calls == 4
+    assert clock.sleeps == [3.0, 5.0, 9.0]  # retry_backoff doubled per attempt, plus the scheduler's margin
+
+def test_replayed_rate_limit_paces_calls(tmp_path, scheduler, clock):
+    fixtures = str(tmp_path / 'fixtures')
+    RecordingClient(StubClient(), fixtures).get_users(ids=['1'])
+
+    replay = ReplayClient(fixtures, rate_limit=2, window=60, scheduler=scheduler, clock=clock, sleep=clock.sleep)
+    analyzer = make_analyzer(tmp_path, replay, scheduler)
+    for _ in range(3):
+        assert analyzer._scheduled(replay.get_users)(ids=['1']).data[0].username == 'one'
+    assert clock.sleeps == [61]
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pandas as pd
+
+from results_store import ResultsStore
+
+def accounts(*rows) -> pd.DataFrame:
+    """Accounts from (username, category, country, engagement_score) tuples."""
+    return pd.DataFrame([
+        {'username': username, 'category': category, 'country': country, 'engagement_score': engagement,
+         'followers_count': 1000, 'ai_rank': 0.5, 'verified': False}
+        for username, category, country, engagement in rows
+    ])
+
+def test_reupserting_replaces_an_accounts_aggregate_contribution(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    store.upsert(accounts(('a', 'nano', 'kenya', 10.0), ('b', 'micro', 'uganda', 20.0)))
+    store.upsert(accounts(('a', 'micro', 'kenya', 30.0)))
+
+    stats = store.stats()
+    assert stats['total_influencers'] == 2
+    assert stats['average_engagement'] == 25.0
+    assert stats['category_distribution'] == {'micro': 2}
+    assert stats['country_distribution'] == {'kenya': 1, 'uganda': 1}
+
+def test_aggregates_match_the_accounts_after_upserts_and_removals(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    store.upsert(accounts(('a', 'nano', 'kenya', 1.0), ('b', 'nano', 'kenya', 2.0), ('c', 'micro', None, 3.0)))
+    store.upsert(accounts(('b', 'macro', 'tanzania', 4.0), ('b', 'macro', 'rwanda', 5.0)))  # Last duplicate wins
+    assert store.remove(['a', 'missing']) == 1
+
+    stats = store.stats()
+    assert stats['total_influencers'] == len(store) == 2
+    assert stats['average_engagement'] == 4.0
+    assert stats['category_distribution'] == {'macro': 1, 'micro': 1}
+    assert stats['country_distribution'] == {'rwanda': 1, 'unknown': 1}
+    assert stats['active_countries'] == 1  # 'unknown' is not a country
+
+def test_trend_rollups_count_every_snapshot(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    june = datetime(2026, 6, 10).timestamp()
+    july = datetime(2026, 7, 10).timestamp()
+    store.upsert(accounts(('a', 'nano', 'kenya', 10.0), ('b', 'nano', 'uganda', 20.0)), captured_at=june)
+    store.upsert(accounts(('a', 'nano', 'kenya', 40.0)), captured_at=june)
+    store.upsert(accounts(('a', 'micro', 'kenya', 60.0)), captured_at=july)
+
+    trends = store.trends('month')
+    assert trends['labels'] == ['2026-06', '2026-07']
+    assert trends['snapshots'] == [3, 1]
+    assert trends['data'] == [(10.0 + 20.0 + 40.0) / 3, 60.0]
+
+    kenya = store.trends('month', 'country', 'Kenya')
+    assert kenya['snapshots'] == [2, 1]
+    assert store.trends('month', 'category', 'nano')['labels'] == ['2026-06']
+
+    # Removing an account keeps its history
+    store.remove(['a'])
+    assert store.trends('month', 'country', 'kenya')['snapshots'] == [2, 1]
+
+def test_upserts_from_another_connection_keep_the_aggregates_consistent(tmp_path):
+    first = ResultsStore(str(tmp_path / 'results.db'))
+    second = ResultsStore(first.path)
+    first.upsert(accounts(('a', 'nano', 'kenya', 1.0)))
+    second.upsert(accounts(('a', 'micro', 'uganda', 2.0)))
+    first.upsert(accounts(('a', 'macro', 'uganda', 3.0)))
+
+    stats = second.stats()
+    assert stats['total_influencers'] == 1
+    assert stats['category_distribution'] == {'macro': 1}
+    assert stats['country_distribution'] == {'uganda': 1}
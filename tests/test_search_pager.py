@@ -0,0 +1,86 @@
+import pytest
+import tweepy
+
+from search_pager import SearchPager
+
+def page(ids, next_token=None) -> tweepy.Response:
+    data = [tweepy.Tweet({'id': str(tweet_id), 'text': 'post'}) for tweet_id in ids]
+    meta = {'result_count': len(data)}
+    if next_token:
+        meta['next_token'] = next_token
+    return tweepy.Response(data or None, {}, [], meta)
+
+class Pages:
+    """Serves canned responses by the token they are requested with, recording every request."""
+
+    def __init__(self, responses, failures=0):
+        self.responses = responses
+        self.failures = failures  # Calls that raise before any succeeds
+        self.tokens = []
+
+    def __call__(self, token):
+        self.tokens.append(token)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('search unavailable')
+        return self.responses[token]
+
+def ids(responses):
+    return [[tweet.id for tweet in response.data or []] for response in responses]
+
+def test_follows_next_token_until_results_run_out():
+    fetch = Pages({None: page([1, 2], 'a'), 'a': page([3], 'b'), 'b': page([4])})
+    pager = SearchPager(fetch, max_pages=10)
+    assert ids(pager) == [[1, 2], [3], [4]]
+    assert fetch.tokens == [None, 'a', 'b']
+    assert pager.exhausted
+    assert pager.pages == pager.requests == 3
+    assert pager.next_token is None
+
+def test_stops_at_the_page_budget_keeping_the_next_token():
+    fetch = Pages({None: page([1], 'a'), 'a': page([2], 'b')})
+    pager = SearchPager(fetch, max_pages=2)
+    assert ids(pager) == [[1], [2]]
+    assert not pager.exhausted
+    assert pager.next_token == 'b'
+
+def test_empty_page_or_repeated_token_exhausts_the_search():
+    fetch = Pages({None: page([1], 'a'), 'a': page([], 'b')})
+    assert ids(SearchPager(fetch, max_pages=10)) == [[1], []]
+    assert fetch.tokens == [None, 'a']
+
+    fetch = Pages({None: page([1], 'a'), 'a': page([2], 'a')})
+    assert ids(SearchPager(fetch, max_pages=10)) == [[1], [2]]
+    assert fetch.tokens == [None, 'a']
+
+def test_duplicate_pages_are_counted_and_skipped():
+    fetch = Pages({None: page([1, 2], 'a'), 'a': page([2, 1], 'b'), 'b': page([3])})
+    pager = SearchPager(fetch, max_pages=10)
+    assert ids(pager) == [[1, 2], [3]]
+    assert pager.duplicate_pages == 1
+    assert pager.pages == 3
+
+def test_resume_continues_from_the_saved_token():
+    fetch = Pages({'b': page([3])})
+    pager = SearchPager(fetch, max_pages=5, next_token='b', pages_done=2)
+    assert ids(pager) == [[3]]
+    assert pager.pages == 3
+
+    # A resumed crawl saved without a token had already run out of results
+    assert list(SearchPager(fetch, max_pages=5, next_token=None, pages_done=2)) == []
+
+def test_failed_fetches_are_retried_with_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr('search_pager.time.sleep', delays.append)
+    retried = []
+    fetch = Pages({None: page([1])}, failures=2)
+    pager = SearchPager(fetch, max_pages=1, retries=2, backoff=1.5,
+                        on_retry=lambda number, e, delay: retried.append(number))
+    assert ids(pager) == [[1]]
+    assert delays == [1.5, 3.0]
+    assert retried == [1, 1]
+
+    pager = SearchPager(Pages({None: page([1])}, failures=3), max_pages=1, retries=2, backoff=0)
+    with pytest.raises(ConnectionError):
+        list(pager)
+    assert pager.pages == 0
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import tweepy
+
+from x_analyzer import XAnalyzer
+
+class TimelineClient:
+    """Serves one author's timeline of original posts, one every `spacing` hours, 100 per page."""
+
+    def __init__(self, posts: int, spacing: float, replies_every: int = 0):
+        self.posts = posts
+        self.spacing = spacing
+        self.replies_every = replies_every  # Every nth tweet replies to someone else
+        self.calls = 0
+
+    def get_users_tweets(self, id, pagination_token=None, **kwargs):
+        self.calls += 1
+        page = int(pagination_token or 0)
+        now = datetime.now(timezone.utc)
+        data = []
+        for n in range(page * 100, min(self.posts, page * 100 + 100)):
+            tweet = {
+                'id': str(n),
+                'text': 'post',
+                'created_at': (now - timedelta(hours=self.spacing * n)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            }
+            if self.replies_every and n % self.replies_every == 0:
+                tweet['in_reply_to_user_id'] = '999'
+                tweet['referenced_tweets'] = [{'type': 'replied_to', 'id': '1'}]
+            data.append(tweepy.Tweet(tweet))
+        meta = {'result_count': len(data)}
+        if (page + 1) * 100 < self.posts:
+            meta['next_token'] = str(page + 1)
+        return tweepy.Response(data, {}, [], meta)
+
+def make_analyzer(tmp_path, client) -> XAnalyzer:
+    return XAnalyzer(
+        cache_path=str(tmp_path / 'profiles.db'), client=client, results_dir=str(tmp_path / 'results'),
+        model_dir=str(tmp_path / 'models'), checkpoint_dir=str(tmp_path / 'checkpoints')
+    )
+
+def test_threshold_met_on_the_last_page_covers_the_whole_year(tmp_path):
+    # 400 posts over about 167 days and nothing older: the year was fully scanned
+    analyzer = make_analyzer(tmp_path, TimelineClient(posts=400, spacing=10))
+    activity = analyzer.scan_user_timeline('1')
+    assert activity['annual_posts'] == 400
+    assert activity['activity_days'] == 365
+
+def test_threshold_met_with_tweets_left_is_a_lower_bound(tmp_path):
+    analyzer = make_analyzer(tmp_path, TimelineClient(posts=1000, spacing=10))
+    activity = analyzer.scan_user_timeline('1')
+    assert activity['annual_posts'] == 400  # Stopped after the page that crossed 365
+    assert activity['activity_days'] == 167
+
+def test_page_limit_below_threshold_is_a_lower_bound(tmp_path):
+    # Two pages hold only 160 original posts, but they span about 8 days
+    analyzer = make_analyzer(tmp_path, TimelineClient(posts=1000, spacing=1, replies_every=5))
+    analyzer.timeline_max_pages = 2
+    activity = analyzer.scan_user_timeline('1')
+    assert activity['annual_posts'] == 160
+    assert activity['activity_days'] == 9
+    assert activity['annual_posts'] * 365 / activity['activity_days'] >= 365  # Qualifies on its annual rate
+
+def test_cached_activity_keeps_its_coverage(tmp_path):
+    client = TimelineClient(posts=1000, spacing=10)
+    analyzer = make_analyzer(tmp_path, client)
+    user = SimpleNamespace(id=1, username='author', public_metrics={'followers_count': 5000})
+    assert analyzer.get_user_activity(user) == (400, 0, 167)
+    calls = client.calls
+    assert analyzer.get_user_activity(user) == (400, 0, 167)
+    assert client.calls == calls
@@ -2,44 +2,81 @@ import tweepy
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import time
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
+import threading
 from dotenv import load_dotenv
-import sys
-from time import sleep
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.ensemble import RandomForestRegressor
+from checkpoint import CheckpointStore
+from criteria import EAST_AFRICAN_LOCATIONS, INFLUENCER_CATEGORIES
+from enrichment import EnrichmentPool
+from location_matcher import LocationMatcher
+from metrics import ACCOUNTS_ACCEPTED, API_CALLS, CANDIDATES_PRUNED, STAGE_SECONDS
+from model_registry import MIN_TRAINING_SAMPLES, ModelRegistry, blend_scores
+from parquet_store import ParquetStore, parquet_available
+from profile_cache import ProfileCache
+from results_snapshot import ResultsSnapshot, snapshot_available
+from results_store import ResultsStore
+from search_pager import SearchPager
+from streaming_ranker import StreamingRanker
+from rate_limiter import RateLimitScheduler, RateLimitedClient
 
 # Load environment variables
 load_dotenv()
 
-def print_progress(seconds_remaining):
-    """Print a progress bar for rate limit waiting."""
-    bar_length = 30
-    filled_length = int(round(bar_length))
-    bar = '=' * filled_length + '-' * (bar_length - filled_length)
-    sys.stdout.write(f'\rWaiting for rate limit: [{bar}] {seconds_remaining}s remaining')
-    sys.stdout.flush()
+# Tweet engagement counts flattened into typed columns of the accounts frame
+METRIC_COLUMNS = ['like_count', 'retweet_count', 'reply_count', 'quote_count']
+
+def activity_days(df: pd.DataFrame) -> pd.Series:
+    """Days the activity counts of each row cover; rows saved before this was tracked count as a full year."""
+    if 'activity_days' not in df.columns:
+        return pd.Series(365, index=df.index, dtype='int64')
+    days = df['activity_days'].fillna(365)
+    return days.where(days > 0, 365).astype('int64')
+
+# Profile fields requested wherever users are expanded or looked up
+USER_FIELDS = ['public_metrics', 'location', 'description', 'verified']
+
+# Most ids or usernames a single get_users request accepts
+USER_LOOKUP_BATCH = 100
 
 class XAnalyzer:
-    def __init__(self):
-        # Initialize API credentials from environment variables
-        self.client = tweepy.Client(
-            bearer_token=os.getenv('BEARER_TOKEN'),
-            consumer_key=os.getenv('API_KEY'),
-            consumer_secret=os.getenv('API_KEY_SECRET'),
-            access_token=os.getenv('ACCESS_TOKEN'),
-            access_token_secret=os.getenv('ACCESS_TOKEN_SECRET'),
-            wait_on_rate_limit=True
-        )
+    def __init__(self, cache_path: str = os.path.join('cache', 'profiles.db'), cache_ttl: int = 7 * 24 * 3600,
+                 client=None, max_workers: int = 4, results_dir: str = 'results', model_dir: str = 'models',
+                 checkpoint_dir: str = 'checkpoints', scheduler: Optional[RateLimitScheduler] = None,
+                 results_store: Optional[ResultsStore] = None):
+        # Per-endpoint rate limit tracking shared by all API calls; a supplied
+        # client (e.g. a clients.ReplayClient) may report to the same scheduler
+        self.scheduler = scheduler or RateLimitScheduler()
+        if self.scheduler.on_wait is None:
+            self.scheduler.on_wait = self._on_rate_limit_wait
         
-        # Initialize AI model components
-        self.scaler = MinMaxScaler()
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            random_state=42
-        )
+        # API client from environment credentials, built on first request unless one is supplied
+        self._client = client
+        self._client_lock = threading.Lock()
+        
+        # Number of authors enriched concurrently while search keeps paging
+        self.max_workers = max_workers
+        
+        # Timeline pages (100 tweets each) read per author in a single scan
+        self.timeline_max_pages = 10
+        
+        # Crawl checkpointing and per-page retry policy
+        self.checkpoints = CheckpointStore(checkpoint_dir)
+        self.checkpoint_every = 5  # Search pages between checkpoints
+        self.stream_chunk_size = 4096  # Accounts scored per chunk in streaming mode
+        self.page_retries = 3
+        self.retry_backoff = 2.0  # Seconds, doubled after every failed attempt
+        self.rate_limit_retries = 5  # Attempts per request that answer 429 before giving up
+        
+        # Versioned ranking models; the active one is loaded on first use and only replaced by train_ranker
+        self.model_registry = ModelRegistry(model_dir)
+        self.ranker = None
+        self.retrain_growth = 2.0  # Suggest retraining once this many times the model's training set is saved
+        self.max_out_of_range = 0.1  # Share of accounts outside the fitted range that suggests retraining
+        self._ranker_warnings = set()  # Versions (None for the blend) already reported as outgrown
         
         # Metric weights for ranking
         self.weights = {
@@ -49,20 +86,78 @@ class XAnalyzer:
         }
         
         # Influencer category thresholds
-        self.categories = {
-            'nano': (1000, 10000),
-            'micro': (10000, 100000),
-            'macro': (100000, float('inf'))
-        }
+        self.categories = dict(INFLUENCER_CATEGORIES)
+        
+        # Authors below the smallest category's follower floor are dropped before any API call
+        self.min_followers = min(min_followers for min_followers, _ in self.categories.values())
         
         # East African countries and cities for strict filtering
-        self.east_african_locations = {
-            'tanzania': ['tanzania', 'dar es salaam', 'dodoma', 'arusha', 'mwanza', 'zanzibar', 'tz'],
-            'kenya': ['kenya', 'nairobi', 'mombasa', 'kisumu', 'nakuru', 'ke'],
-            'uganda': ['uganda', 'kampala', 'entebbe', 'jinja', 'gulu', 'ug'],
-            'rwanda': ['rwanda', 'kigali', 'butare', 'gisenyi', 'rw'],
-            'burundi': ['burundi', 'bujumbura', 'gitega', 'bi']
-        }
+        self.east_african_locations = EAST_AFRICAN_LOCATIONS
+        self.location_matcher = LocationMatcher(self.east_african_locations)
+        
+        # Persistent per-user cache of timeline lookups
+        self.profile_cache = ProfileCache(cache_path, ttl=cache_ttl)
+        
+        # Indexed store of every ranked account, updated by save_results
+        self.results_dir = results_dir
+        self.results_store = results_store or ResultsStore(os.path.join(results_dir, 'results.db'))
+        
+        # Typed, partitioned Parquet copy of saved results when pyarrow is installed;
+        # CSV files are then only written on request
+        self.parquet_store = ParquetStore(os.path.join(results_dir, 'parquet')) if parquet_available() else None
+        
+        # Memory-mapped Arrow snapshot of the store that API workers read; rebuilt after every save
+        self.results_snapshot = None
+        if snapshot_available():
+            self.results_snapshot = ResultsSnapshot(os.path.join(results_dir, 'accounts.arrow'))
+            self.results_store.add_listener(lambda records: self.results_snapshot.write(self.results_store))
+            self.results_store.add_remove_listener(lambda usernames: self.results_snapshot.write(self.results_store))
+        
+        # API request counters per endpoint and stats from the last run
+        self.api_calls = Counter()
+        self.last_run_stats = {}
+        self.topic_stats = {}  # topic -> stats of its latest run
+        self.last_batch_stats = {}
+        self.last_refresh_stats = {}
+        self._stats_lock = threading.Lock()
+        self._rank_lock = threading.Lock()  # Guards loading or bootstrapping the ranker
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        """API client, created from environment credentials on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = RateLimitedClient.from_env(self.scheduler)
+        return self._client
+
+    def _on_rate_limit_wait(self, endpoint: str, seconds: float):
+        """Report a scheduler wait on an exhausted endpoint."""
+        print(f"\nRate limit reached for {endpoint}, waiting {int(seconds)}s...")
+
+    def _scheduled(self, method):
+        """Wrap a client method so every request goes through the rate limit scheduler."""
+        endpoint = method.__name__
+        
+        @functools.wraps(method)  # Paginator picks its token parameter from the method name
+        def call(*args, **kwargs):
+            for attempt in range(self.rate_limit_retries + 1):
+                self.scheduler.acquire(endpoint)
+                with self._stats_lock:
+                    self.api_calls[endpoint] += 1
+                API_CALLS.inc(endpoint=endpoint)
+                self._local.calls = getattr(self._local, 'calls', 0) + 1
+                try:
+                    return method(*args, **kwargs)
+                except tweepy.TooManyRequests as e:
+                    if attempt == self.rate_limit_retries:
+                        raise
+                    if not self.scheduler.update(endpoint, e.response.headers):
+                        # Nothing says when the window resets: back off before the next attempt
+                        self.scheduler.defer(endpoint, self.retry_backoff * 2 ** attempt)
+                    
+        return call
 
     def get_influencer_category(self, followers: int) -> str:
         """Determine influencer category based on follower count."""
@@ -71,8 +166,36 @@ class XAnalyzer:
                 return category
         return 'nano'  # Default category
 
+    def is_original_post(self, tweet) -> bool:
+        """Check that a tweet is neither a retweet nor a reply."""
+        return not any(
+            ref.type in ('retweeted', 'replied_to')
+            for ref in (tweet.referenced_tweets or [])
+        )
+
+    def prefilter_candidate(self, user) -> Optional[str]:
+        """Reject authors on the profile fields a search response already carries.
+        
+        Returns the reason ('followers' or 'tweet_count') an author cannot
+        qualify, or None if they are worth the location check and timeline scan.
+        """
+        public_metrics = user.public_metrics or {}
+        if public_metrics.get('followers_count', 0) < self.min_followers:
+            return 'followers'
+        # Lifetime tweets, retweets and replies included, bound the past year's original posts
+        if public_metrics.get('tweet_count', 0) < 365:
+            return 'tweet_count'
+        return None
+
+    def extract_location_info(self, location: str) -> Tuple[bool, str]:
+        """Check whether a profile location is in East Africa and return its country."""
+        return self.location_matcher.match(location)
+
     def calculate_engagement_score(self, metrics: Dict) -> float:
-        """Calculate normalized engagement score."""
+        """Calculate normalized engagement score.
+        
+        Works on a single metrics dict or, element-wise, on a whole DataFrame.
+        """
         total_engagement = (
             metrics['like_count'] * 1.0 +
             metrics['retweet_count'] * 1.5 +
@@ -80,177 +203,770 @@ class XAnalyzer:
         )
         return total_engagement
 
-    def calculate_intensity_score(self, annual_posts: int, thread_count: int) -> float:
-        """Calculate posting intensity score."""
-        daily_avg = annual_posts / 365
-        return (daily_avg * 0.7) + (thread_count * 0.3)  # Weight regular posts and threads
+    def calculate_intensity_score(self, annual_posts: int, thread_count: int, activity_days: int = 365) -> float:
+        """Calculate posting intensity score for scalars or whole columns.
+        
+        activity_days is how many days the counts cover; counts from a scan
+        cut short are annualized rather than scored as if they spanned a year.
+        """
+        daily_avg = annual_posts / activity_days
+        annual_threads = thread_count * 365 / activity_days
+        return (daily_avg * 0.7) + (annual_threads * 0.3)  # Weight regular posts and threads
 
-    def get_thread_count(self, user_id: str) -> int:
-        """Count number of thread posts in recent tweets."""
-        try:
-            thread_count = 0
-            prev_tweet_id = None
-            
-            for response in tweepy.Paginator(
-                self.client.get_users_tweets,
-                user_id,
-                tweet_fields=['conversation_id', 'in_reply_to_user_id'],
-                max_results=100,
-                limit=5  # Look at recent 500 tweets max
-            ):
-                if not response.data:
-                    break
+    @STAGE_SECONDS.time(stage='timeline')
+    def scan_user_timeline(self, user_id: str, stop_at_threshold: bool = True) -> Dict:
+        """Walk a user's past-year timeline once, collecting posts, threads and engagement.
+        
+        Stops early once the annual post threshold is met (unless stop_at_threshold
+        is False), when the one-year window runs out, or after timeline_max_pages.
+        The counts of a scan stopped early are lower bounds: activity_days is
+        then the number of days they cover, and 365 when the year was scanned.
+        API errors propagate, so a failed scan is never mistaken for a quiet account.
+        """
+        activity = {
+            'annual_posts': 0,
+            'thread_count': 0,
+            'tweets_scanned': 0,
+            'like_count': 0,
+            'retweet_count': 0,
+            'reply_count': 0,
+            'quote_count': 0,
+            'activity_days': 365
+        }
+        
+        now = datetime.utcnow()
+        start_time = now - timedelta(days=365)
+        oldest = None  # Creation time of the oldest tweet scanned
+        pages = 0
+        
+        for response in tweepy.Paginator(
+            self._scheduled(self.client.get_users_tweets),
+            user_id,
+            exclude=['retweets'],
+            start_time=start_time,
+            tweet_fields=['created_at', 'in_reply_to_user_id', 'referenced_tweets', 'public_metrics'],
+            max_results=100,
+            limit=self.timeline_max_pages
+        ):
+            if not response.data:
+                break
+            pages += 1
+                
+            for tweet in response.data:
+                if tweet.created_at is not None:
+                    created_at = tweet.created_at.replace(tzinfo=None)
+                    if created_at < start_time:
+                        return activity
+                    oldest = created_at
+                    
+                activity['tweets_scanned'] += 1
+                
+                # Self-replies are thread posts, other replies are not original content
+                if str(tweet.in_reply_to_user_id) == str(user_id):
+                    activity['thread_count'] += 1
+                elif self.is_original_post(tweet):
+                    activity['annual_posts'] += 1
                     
-                for tweet in response.data:
-                    # Check if tweet is part of a thread (self-reply)
-                    if tweet.in_reply_to_user_id == user_id:
-                        thread_count += 1
+                for key, value in (tweet.public_metrics or {}).items():
+                    if key in activity:
+                        activity[key] += value
                         
-            return thread_count
+            threshold_met = stop_at_threshold and activity['annual_posts'] >= 365
+            if threshold_met or pages >= self.timeline_max_pages:
+                if (response.meta or {}).get('next_token') and oldest is not None:
+                    # Tweets of the year are left unscanned: the counts cover only back to the oldest one
+                    activity['activity_days'] = min(365, (now - oldest).days + 1)
+                break
+                
+        return activity
+
+    def get_user_timeline(self, user_id: str) -> int:
+        """Count original posts made in the past year."""
+        return self.scan_user_timeline(user_id)['annual_posts']
+
+    def get_thread_count(self, user_id: str) -> int:
+        """Count number of thread posts in recent tweets."""
+        return self.scan_user_timeline(user_id)['thread_count']
+
+    def get_user_activity(self, user, refresh: bool = False) -> Tuple[int, int, int]:
+        """Get annual posts, thread count and the days they cover, using the profile cache when possible.
+        
+        Only completed scans are cached; a scan that fails raises and leaves the cache alone.
+        Entries cached before scans recorded activity_days are rescanned, since
+        their counts may be lower bounds.
+        """
+        cached = None if refresh else self.profile_cache.get(user.id)
+        if cached is not None and cached['thread_count'] is not None and 'activity_days' in cached['timeline_metrics']:
+            return cached['annual_posts'], cached['thread_count'], cached['timeline_metrics']['activity_days']
             
-        except Exception as e:
-            print(f"Error counting threads for user {user_id}: {str(e)}")
-            return 0
+        activity = self.scan_user_timeline(user.id)
+        
+        self.profile_cache.put(
+            user.id,
+            user.username,
+            activity['annual_posts'],
+            activity['thread_count'],
+            user.public_metrics,
+            timeline_metrics=activity
+        )
+        return activity['annual_posts'], activity['thread_count'], activity['activity_days']
+
+    @STAGE_SECONDS.time(stage='enrich')
+    def _enrich_user(self, user, refresh: bool = False) -> Tuple[int, int, int, int]:
+        """Fetch one author's activity on a worker thread, counting the API calls it took."""
+        self._local.calls = 0
+        annual_posts, thread_count, activity_days = self.get_user_activity(user, refresh=refresh)
+        return annual_posts, thread_count, activity_days, self._local.calls
+
+    def get_influencer_categories(self, followers: pd.Series) -> np.ndarray:
+        """Vectorized get_influencer_category for a whole followers column."""
+        followers = followers.to_numpy()
+        conditions = [
+            (followers >= min_followers) & (followers < max_followers)
+            for min_followers, max_followers in self.categories.values()
+        ]
+        return np.select(conditions, list(self.categories.keys()), default='nano')
+
+    def build_accounts_frame(self, accounts: List[Dict]) -> pd.DataFrame:
+        """Build the accounts frame with typed numeric columns.
+        
+        Frames from older callers that still carry a nested 'metrics' dict
+        have it flattened into METRIC_COLUMNS.
+        """
+        df = pd.DataFrame(accounts)
+        
+        if 'metrics' in df.columns:
+            metrics = pd.DataFrame(df.pop('metrics').tolist(), index=df.index)
+            for column in METRIC_COLUMNS:
+                df[column] = metrics[column] if column in metrics else 0
+                
+        count_columns = METRIC_COLUMNS + [
+            'followers_count', 'following_count', 'tweet_count', 'annual_posts', 'thread_count'
+        ]
+        for column in count_columns:
+            if column in df.columns:
+                df[column] = df[column].fillna(0).astype('int64')
+        df['activity_days'] = activity_days(df)
+                
+        return df
+
+    def add_scores(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compute engagement and intensity scores once, as vectorized column arithmetic."""
+        if 'engagement_score' not in df.columns:
+            df['engagement_score'] = self.calculate_engagement_score(df).astype('float64')
+        if 'intensity_score' not in df.columns:
+            df['intensity_score'] = self.calculate_intensity_score(
+                df['annual_posts'], df['thread_count'], activity_days(df)
+            ).astype('float64')
+        return df
+
+    def preview_account(self, account_info: Dict) -> Dict:
+        """Score a single accepted account for streaming, before the batch AI ranking."""
+        return dict(
+            account_info,
+            category=self.get_influencer_category(account_info['followers_count']),
+            engagement_score=float(self.calculate_engagement_score(account_info)),
+            intensity_score=float(self.calculate_intensity_score(
+                account_info['annual_posts'], account_info['thread_count'],
+                account_info.get('activity_days') or 365
+            )),
+            ai_rank=None
+        )
+
+    def get_ranker(self) -> Optional[Dict]:
+        """The active ranking model, loaded on first use; None until one is trained.
+        
+        Scoring never trains: a version is only replaced by train_ranker (or
+        python model_registry.py), so ranks stay comparable across searches.
+        Versions fitted on fewer than MIN_TRAINING_SAMPLES accounts are not used.
+        """
+        with self._rank_lock:
+            if self.ranker is None:
+                self.ranker = self.model_registry.load()
+            if self.ranker is not None and self.ranker['n_samples'] < MIN_TRAINING_SAMPLES:
+                return None
+            return self.ranker
+
+    def ranker_outgrown(self, ranker: Optional[Dict], df: pd.DataFrame) -> Optional[str]:
+        """Why the ranking model should be retrained before scoring df, or None.
+        
+        Accounts are counted once by username, whether they are saved, being
+        ranked or both.
+        """
+        usernames = df['username'].unique().tolist()
+        available = len(self.results_store) + len(usernames) - self.results_store.count_stored(usernames)
+        if ranker is None:
+            if available >= MIN_TRAINING_SAMPLES:
+                return f"no ranking model is trained yet and {available} accounts are available"
+            return None
+        if available >= ranker['n_samples'] * self.retrain_growth:
+            return f"{available} accounts are available, {self.retrain_growth:g}x the training set of v{ranker['version']}"
+        outside = self.model_registry.out_of_range(ranker, df)
+        if outside > self.max_out_of_range * len(df):
+            return f"{outside} accounts are outside the range v{ranker['version']} was fitted on"
+        return None
+
+    def train_ranker(self) -> int:
+        """Train a new ranking model on the saved accounts and switch to it.
+        
+        This is the explicit retraining step; scores computed before it are not
+        comparable to scores computed after.
+        """
+        version = self.model_registry.train(self.results_store.to_frame(), self.weights)
+        with self._rank_lock:
+            self.ranker = self.model_registry.load(version)
+        return version
 
     def calculate_ai_rank(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate AI-based ranking using multiple metrics."""
+        return self.rank_with(df, self.get_ranker())
+
+    @STAGE_SECONDS.time(stage='rank')
+    def rank_with(self, df: pd.DataFrame, ranker: Optional[Dict]) -> pd.DataFrame:
+        """Rank accounts with a given model version, or the blend for None.
+        
+        Runs that score several frames (streamed chunks) resolve the model once
+        and pass it here, so all their ranks come from the same version.
+        """
         if df.empty:
             return df
             
-        # Prepare features for AI ranking
-        features = pd.DataFrame()
-        features['engagement_score'] = df.apply(
-            lambda x: self.calculate_engagement_score(x['metrics']), axis=1
-        )
-        features['intensity_score'] = df.apply(
-            lambda x: self.calculate_intensity_score(x['annual_posts'], x['thread_count']), axis=1
-        )
-        features['follower_score'] = df['followers_count'].apply(np.log1p)  # Log transform for better scaling
-        
-        # Normalize features
-        features_scaled = self.scaler.fit_transform(features)
+        df = self.add_scores(df)
         
-        # Train model on normalized features (using engagement as target for initial ranking)
-        self.model.fit(features_scaled, features['engagement_score'])
-        
-        # Get feature importance and calculate final rank
-        importance = self.model.feature_importances_
-        df['ai_rank'] = self.model.predict(features_scaled)
+        # Score with the registered model; it is never refit per search
+        version = ranker['version'] if ranker is not None else None
+        if version not in self._ranker_warnings:
+            reason = self.ranker_outgrown(ranker, df)
+            if reason is not None:
+                self._ranker_warnings.add(version)  # Once per version, not for every search or chunk
+                print(f"Warning: {reason}; train a new version with python main.py --train-ranker")
+        if ranker is None:
+            # No model yet: the documented weighted blend over fixed ranges
+            df['ai_rank'] = blend_scores(df, self.weights)
+        else:
+            df['ai_rank'] = self.model_registry.score(ranker, df)
         
         # Add influencer categories
-        df['category'] = df['followers_count'].apply(self.get_influencer_category)
+        df['category'] = self.get_influencer_categories(df['followers_count'])
         
         return df.sort_values('ai_rank', ascending=False)
 
-    def analyze_accounts(self, topic: str, max_pages: int = 25) -> pd.DataFrame:
-        """Analyze X accounts with enhanced metrics and AI ranking."""
-        accounts = []
+    @STAGE_SECONDS.time(stage='search_page')
+    def _fetch_search_page(self, query: str, next_token: Optional[str] = None):
+        """Fetch one page of recent-search results, continuing from next_token."""
+        kwargs = {'next_token': next_token} if next_token else {}
+        return self._scheduled(self.client.search_recent_tweets)(
+            query=query,
+            tweet_fields=['public_metrics', 'created_at', 'referenced_tweets', 'conversation_id'],
+            user_fields=USER_FIELDS,
+            expansions=['author_id'],
+            max_results=100,
+            **kwargs
+        )
+
+    @STAGE_SECONDS.time(stage='analyze')
+    def analyze_accounts(self, topic: str, max_pages: int = 25, refresh: bool = False,
+                         on_progress: Optional[Callable[[Dict], None]] = None,
+                         resume: bool = True, enrichment: Optional[EnrichmentPool] = None,
+                         stream_top_n: Optional[int] = None) -> pd.DataFrame:
+        """Analyze X accounts with enhanced metrics and AI ranking.
+        
+        Set refresh=True to ignore cached timeline lookups and refetch them.
+        on_progress, if given, receives structured events: 'progress' snapshots
+        of the run's counters after every search page and enrichment result,
+        and an 'account' event with a scored preview of each accepted account.
+        
+        The crawl is checkpointed every checkpoint_every pages and after a page
+        keeps failing; with resume=True a new run on the same topic and max_pages picks up
+        from the last checkpoint instead of starting over. A crawl cut short
+        still returns what it found, with stats['interrupted'] set and
+        'interrupted' true in its last progress event.
+        
+        Concurrent searches can pass a shared EnrichmentPool so an author found
+        by several of them is enriched only once (see analyze_topics).
+        
+        With stream_top_n set, accepted accounts go into a fixed-size typed
+        buffer that is scored every stream_chunk_size accounts, and only the
+        top stream_top_n accounts of each category are kept and returned, so
+        memory stays flat however many candidates the crawl finds. Every scored
+        chunk is saved with save_results as it goes, so the full ranking is
+        persisted and callers should not save the returned top N again.
+        """
+        accounts = {}  # username -> account info
+        seen_users = {}  # user id -> outcome ('pending', a rejection reason or 'accepted')
+        repeats = Counter()  # user id -> times the author showed up again
+        costs = {}  # user id -> per-user API calls its enrichment took
+        pending = {}  # enrichment future -> (user, tweet metrics, country)
+        stats = Counter()
         query = f"{topic} lang:en -is:retweet -is:reply"
         page_count = 0
+        next_token = None
+        resumed = []  # candidates queued when the checkpoint was taken
+        self.profile_cache.evict_expired()
+        
+        ranker = None
+        if stream_top_n is not None:
+            def save_chunk(chunk: pd.DataFrame):
+                self.save_results(chunk, topic)
+                stats['chunks_saved'] += 1
+            
+            # Every chunk is scored by the same model, so the per-category heaps compare like with like
+            score_chunk = functools.partial(self.rank_with, ranker=self.get_ranker())
+            ranker = StreamingRanker(score_chunk, top_n=stream_top_n,
+                                     chunk_size=self.stream_chunk_size, on_chunk=save_chunk)
+        
+        def accepted_count() -> int:
+            return ranker.accepted if ranker is not None else len(accounts)
+        
+        checkpoint = self.checkpoints.load(topic, max_pages) if resume else None
+        if checkpoint is not None:
+            page_count = checkpoint['page_count']
+            next_token = checkpoint['next_token']
+            accounts = checkpoint['accounts']
+            seen_users = {int(user_id): outcome for user_id, outcome in checkpoint['seen_users'].items()}
+            repeats = Counter({int(user_id): count for user_id, count in checkpoint['repeats'].items()})
+            costs = {int(user_id): cost for user_id, cost in checkpoint['costs'].items()}
+            stats = Counter(checkpoint['stats'])
+            resumed = checkpoint['pending']
+            if ranker is not None:
+                if checkpoint.get('stream'):
+                    ranker.restore(checkpoint['stream'])
+                for account_info in accounts.values():
+                    ranker.add(account_info)
+                accounts = {}
+            elif checkpoint.get('stream'):
+                # Streaming checkpoint resumed in full mode: keep what it retained
+                state = checkpoint['stream']
+                scored = [dict(zip(state['columns'], row)) for row in state['top']]
+                for account_info in scored + state['pending']:
+                    # Scores are recomputed with the full ranking; stale ones would leave new accounts unscored
+                    for column in ('engagement_score', 'intensity_score', 'ai_rank', 'category'):
+                        account_info.pop(column, None)
+                    accounts[account_info['username']] = account_info
+            print(f"\nResuming '{topic}' from page {page_count} with {accepted_count()} accounts found so far")
+        
+        def report_progress(stage: str):
+            if on_progress is not None:
+                on_progress({
+                    'type': 'progress',
+                    'stage': stage,
+                    'pages': page_count,
+                    'max_pages': max_pages,
+                    'candidates': len(seen_users),
+                    'enrichment_queued': len(pending),
+                    'accounts_accepted': accepted_count(),
+                    'interrupted': bool(stats['interrupted']),
+                    'rate_limit_wait': round(self.scheduler.max_wait_time(), 1)
+                })
+        
+        def finalize(future):
+            """Record a finished enrichment as an accepted or rejected author."""
+            user, metrics, country = pending.pop(future)
+            try:
+                annual_posts, thread_count, activity_days, cost = future.result()
+            except Exception as e:
+                # Not a verdict on the author: a resumed or later run looks them up again
+                seen_users[user.id] = 'error'
+                stats['enrichment_errors'] += 1
+                print(f"Error scanning timeline for @{user.username}: {str(e)}")
+                return
+            costs[user.id] = cost
+            
+            # Qualify on the annual rate: counts from a scan stopped early cover fewer days
+            if annual_posts * 365 / activity_days < 365:
+                seen_users[user.id] = 'activity'
+                stats['rejected_activity'] += 1
+                CANDIDATES_PRUNED.inc(reason='activity')
+                return
+            
+            seen_users[user.id] = 'accepted'
+            ACCOUNTS_ACCEPTED.inc()
+            
+            account_info = {
+                'username': user.username,
+                'user_id': str(user.id),
+                'name': user.name,
+                'location': user.location,
+                'country': country,
+                'followers_count': user.public_metrics['followers_count'],
+                'following_count': user.public_metrics['following_count'],
+                'tweet_count': user.public_metrics['tweet_count'],
+                'annual_posts': annual_posts,
+                'thread_count': thread_count,
+                'activity_days': activity_days,
+                'verified': user.verified,
+                'description': user.description
+            }
+            account_info.update({column: metrics.get(column, 0) for column in METRIC_COLUMNS})
+            
+            if ranker is not None:
+                ranker.add(account_info)
+            else:
+                accounts[user.username] = account_info
+            if on_progress is not None:
+                on_progress({'type': 'account', 'account': self.preview_account(account_info)})
+            print(f"Found new account: @{user.username} from {user.location}")
+            print(f"  - Annual posts: {annual_posts}" + (f"+ (in {activity_days} days)" if activity_days < 365 else ""))
+            print(f"  - Threads: {thread_count}")
+            print(f"  - Country: {country.title()}")
+            report_progress('enriching')
+        
+        def collect_finished():
+            """Record the enrichments that have finished so far, without waiting for the rest."""
+            for future in [future for future in pending if future.done()]:
+                finalize(future)
+        
+        def save_checkpoint():
+            """Persist everything resolved so far plus the still-queued candidates."""
+            collect_finished()
+            self.checkpoints.save(topic, max_pages, {
+                'page_count': page_count,
+                'next_token': next_token,
+                'accounts': accounts,
+                'stream': ranker.state() if ranker is not None else None,
+                'seen_users': {user_id: outcome for user_id, outcome in seen_users.items() if outcome != 'error'},
+                'repeats': repeats,
+                'costs': costs,
+                'stats': stats,
+                'pending': [
+                    {'user': user.data, 'metrics': metrics, 'country': country}
+                    for user, metrics, country in pending.values()
+                ]
+            })
         
         print(f"\nSearching for accounts related to '{topic}'...")
         print("This may take a while as we analyze metrics and verify locations.")
+        report_progress('searching')
+        
+        def enrich(user, metrics: Dict, country: str):
+            future, shared = pool.submit(user, refresh)
+            if shared:
+                stats['shared_enrichments'] += 1
+            pending[future] = (user, metrics, country)
         
-        while page_count < max_pages:
+        # Authors are enriched on worker threads while the search keeps paging
+        own_pool = enrichment is None
+        pool = EnrichmentPool(self._enrich_user, self.max_workers) if own_pool else enrichment
+        try:
+            for candidate in resumed:
+                enrich(tweepy.User(candidate['user']), candidate['metrics'], candidate['country'])
+            
+            pager = SearchPager(
+                lambda token: self._fetch_search_page(query, token),
+                max_pages,
+                next_token=next_token,
+                pages_done=page_count,
+                retries=self.page_retries,
+                backoff=self.retry_backoff,
+                on_retry=lambda page, e, delay: print(
+                    f"\nError fetching page {page}: {str(e)}; retrying in {delay:.0f}s"
+                )
+            )
+            failed = False
             try:
-                for response in tweepy.Paginator(
-                    self.client.search_recent_tweets,
-                    query=query,
-                    tweet_fields=['public_metrics', 'created_at', 'referenced_tweets', 'conversation_id'],
-                    user_fields=['public_metrics', 'location', 'description', 'verified'],
-                    expansions=['author_id'],
-                    max_results=100,
-                    limit=1
-                ):
-                    page_count += 1
+                for response in pager:
+                    page_count, next_token = pager.pages, pager.next_token
                     print(f"Processing page {page_count}/{max_pages}...")
                     
-                    if not response.data:
-                        continue
-                        
-                    users = {u.id: u for u in response.includes['users']}
+                    users = {u.id: u for u in (response.includes or {}).get('users', [])}
                     
-                    for tweet in response.data:
+                    for tweet in response.data or []:
                         if not self.is_original_post(tweet):
                             continue
                             
                         user = users[tweet.author_id]
                         
-                        is_east_african, country = self.extract_location_info(user.location)
-                        if not is_east_african:
+                        # Authors already accepted, rejected or queued this run need no more API work
+                        if user.id in seen_users:
+                            repeats[user.id] += 1
+                            CANDIDATES_PRUNED.inc(reason='duplicate')
                             continue
-                            
-                        annual_posts = self.get_user_timeline(user.id)
-                        if annual_posts < 365:
+                        
+                        # Cheapest checks first; only survivors cost per-user API calls
+                        reason = self.prefilter_candidate(user)
+                        if reason is None:
+                            is_east_african, country = self.extract_location_info(user.location)
+                            reason = None if is_east_african else 'location'
+                        if reason is not None:
+                            seen_users[user.id] = reason
+                            stats[f'rejected_{reason}'] += 1
+                            CANDIDATES_PRUNED.inc(reason=reason)
                             continue
                             
-                        thread_count = self.get_thread_count(user.id)
+                        seen_users[user.id] = 'pending'
+                        enrich(user, tweet.public_metrics or {}, country)
                         
-                        account_info = {
-                            'username': user.username,
-                            'name': user.name,
-                            'location': user.location,
-                            'country': country,
-                            'followers_count': user.public_metrics['followers_count'],
-                            'following_count': user.public_metrics['following_count'],
-                            'tweet_count': user.public_metrics['tweet_count'],
-                            'annual_posts': annual_posts,
-                            'thread_count': thread_count,
-                            'metrics': tweet.public_metrics,
-                            'verified': user.verified,
-                            'description': user.description
-                        }
+                    # Accounts found while this page was processed are reported now, not after paging ends
+                    collect_finished()
+                    report_progress('searching')
+                    if page_count % self.checkpoint_every == 0:
+                        save_checkpoint()
                         
-                        if not any(acc['username'] == user.username for acc in accounts):
-                            accounts.append(account_info)
-                            print(f"Found new account: @{user.username} from {user.location}")
-                            print(f"  - Annual posts: {annual_posts}")
-                            print(f"  - Threads: {thread_count}")
-                            print(f"  - Country: {country.title()}")
-                            
-            except tweepy.TooManyRequests as e:
-                reset_time = int(e.response.headers.get('x-rate-limit-reset', 0))
-                self.handle_rate_limit(reset_time)
-                continue
-                
             except Exception as e:
-                print(f"\nError occurred: {str(e)}")
-                break
+                failed = True
+                print(f"\nError occurred: {str(e)}; saving checkpoint at page {pager.pages}")
+                
+            page_count, next_token = pager.pages, pager.next_token
+            
+            # Collect the remaining enrichment results in submission order
+            report_progress('enriching')
+            for future in list(pending):
+                finalize(future)
+        finally:
+            if own_pool:
+                pool.shutdown()
+        
+        if failed:
+            # Keep the checkpoint so the next run resumes instead of starting over
+            save_checkpoint()
+            stats['interrupted'] = 1  # The ranking covers only the pages fetched so far
+        else:
+            self.checkpoints.clear(topic, max_pages)
         
+        stats['api_calls_saved'] = sum(count * costs.get(user_id, 0) for user_id, count in repeats.items())
+        stats['duplicate_authors_skipped'] = sum(repeats.values())
+        stats['prefiltered'] = stats['rejected_followers'] + stats['rejected_tweet_count']
+        stats['search_requests'] = pager.requests
+        stats['duplicate_pages'] = pager.duplicate_pages
+        stats['pages_per_second'] = round(pager.pages_per_second, 2)
+        report_progress('ranking')
+        stats['accounts_found'] = accepted_count()
+        if ranker is not None:
+            ranker.flush()  # Score and save the last partial chunk before the stats are recorded
+            stats['chunks_scored'] = ranker.chunks_scored
+        with self._stats_lock:
+            self.last_run_stats = self.topic_stats[topic] = dict(stats)
+        if stats['prefiltered']:
+            print(f"Pre-filtered {stats['prefiltered']} authors before the location check and timeline scan "
+                  f"({stats['rejected_followers']} below {self.min_followers} followers, "
+                  f"{stats['rejected_tweet_count']} with under 365 tweets in total)")
+        if stats['duplicate_authors_skipped']:
+            print(f"Skipped {stats['duplicate_authors_skipped']} repeat authors, "
+                  f"saving {stats['api_calls_saved']} API calls")
+        print(f"Fetched {pager.requests} search pages at {pager.pages_per_second:.2f} pages/sec "
+              f"({pager.duplicate_pages} duplicate pages skipped)")
+        
+        if ranker is not None:
+            return ranker.result()
+            
         if not accounts:
             return pd.DataFrame()
             
         # Create DataFrame and apply AI ranking
-        df = pd.DataFrame(accounts)
+        df = self.build_accounts_frame(list(accounts.values()))
         return self.calculate_ai_rank(df)
     
-    def save_results(self, df: pd.DataFrame, topic: str) -> str:
-        """Save results with enhanced metrics to CSV."""
-        if df.empty:
+    def analyze_topics(self, topics: List[str], max_pages: int = 25, refresh: bool = False,
+                       on_progress: Optional[Callable[[Dict], None]] = None,
+                       max_concurrent: int = 4,
+                       stream_top_n: Optional[int] = None) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """Analyze several topics concurrently, enriching each author once across all of them.
+        
+        Returns the per-topic rankings and a combined cross-topic leaderboard.
+        Events passed to on_progress carry the topic they belong to. With
+        stream_top_n set each topic is streamed as in analyze_accounts, saving
+        its chunks as they are scored.
+        """
+        topics = list(dict.fromkeys(' '.join(topic.split()) for topic in topics if topic.strip()))
+        if not topics:
+            return {}, pd.DataFrame()
+        
+        def run(pool: EnrichmentPool, topic: str) -> pd.DataFrame:
+            report = (lambda event: on_progress(dict(event, topic=topic))) if on_progress else None
+            return self.analyze_accounts(topic, max_pages=max_pages, refresh=refresh,
+                                         on_progress=report, enrichment=pool, stream_top_n=stream_top_n)
+        
+        with EnrichmentPool(self._enrich_user, self.max_workers) as pool:
+            with ThreadPoolExecutor(max_workers=min(max_concurrent, len(topics)),
+                                    thread_name_prefix='topic') as executor:
+                rankings = dict(zip(topics, executor.map(functools.partial(run, pool), topics)))
+        
+        combined = self.combine_rankings(rankings)
+        self.last_batch_stats = {
+            'topics': len(topics),
+            'authors_enriched': pool.submitted,
+            'shared_enrichments': pool.shared,
+            'accounts_per_topic': {topic: len(df) for topic, df in rankings.items()},
+            'accounts_found': len(combined)
+        }
+        print(f"\nBatch of {len(topics)} topics: {len(combined)} distinct accounts, "
+              f"{pool.submitted} authors enriched, {pool.shared} lookups shared across topics")
+        return rankings, combined
+    
+    def combine_rankings(self, rankings: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Merge per-topic rankings into one leaderboard, one row per account.
+        
+        An account found by several topics keeps its best-ranked row and lists
+        every topic it was found for.
+        """
+        frames = [df.assign(topic=topic) for topic, df in rankings.items() if not df.empty]
+        if not frames:
+            return pd.DataFrame()
+        
+        combined = pd.concat(frames, ignore_index=True)
+        topics = combined.groupby('username', sort=False)['topic'].agg(', '.join)
+        combined = combined.sort_values('ai_rank', ascending=False).drop_duplicates('username')
+        combined['topic'] = combined['username'].map(topics)
+        return combined.reset_index(drop=True)
+    
+    def lookup_users(self, ids: List[str] = (), usernames: List[str] = ()) -> Tuple[List, int]:
+        """Fetch user profiles in get_users batches of USER_LOOKUP_BATCH.
+        
+        Batches run on max_workers threads, each request waiting on the rate
+        limit scheduler, so lookups are pipelined up to the endpoint's limit.
+        Returns the users found and how many ids or usernames were not.
+        """
+        batches = [
+            {key: list(values[start:start + USER_LOOKUP_BATCH])}
+            for key, values in (('ids', list(ids)), ('usernames', list(usernames)))
+            for start in range(0, len(values), USER_LOOKUP_BATCH)
+        ]
+        get_users = self._scheduled(self.client.get_users)
+        
+        def fetch(batch: Dict):
+            try:
+                return get_users(user_fields=USER_FIELDS, **batch)
+            except Exception as e:
+                print(f"Error looking up {len(next(iter(batch.values())))} users: {str(e)}")
+                return None
+                
+        users = []
+        missing = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='lookup') as executor:
+            for batch, response in zip(batches, executor.map(fetch, batches)):
+                found = (response.data or []) if response is not None else []
+                users.extend(found)
+                missing += len(next(iter(batch.values()))) - len(found)
+        return users, missing
+    
+    def refresh_accounts(self, usernames: Optional[List[str]] = None) -> pd.DataFrame:
+        """Refresh the profiles of saved accounts in bulk and write them back to the results store.
+        
+        Follower, following and tweet counts, verification, name, location and
+        description are re-hydrated with batched get_users lookups (by user id,
+        or by username for accounts saved before ids were kept); category and
+        AI rank are recomputed from them. Activity and engagement figures come
+        from timeline scans and are kept. Accounts whose new location is no
+        longer in East Africa no longer qualify and are removed from the
+        store, its leaderboards and dashboard stats. Accounts that can no
+        longer be looked up (suspended, deleted) are left as they were.
+        """
+        stored = self.results_store.accounts(usernames)
+        if not stored:
+            return pd.DataFrame()
+            
+        requests_before = self.api_calls['get_users']
+        users, missing = self.lookup_users(
+            ids=[account['user_id'] for account in stored if account['user_id']],
+            usernames=[account['username'] for account in stored if not account['user_id']]
+        )
+        by_id = {str(user.id): user for user in users}
+        by_username = {user.username.lower(): user for user in users}
+        
+        refreshed = []
+        left_region = []  # Usernames of accounts now located outside East Africa
+        for account in stored:
+            user = by_id.get(account['user_id']) if account['user_id'] else by_username.get(account['username'].lower())
+            if user is None:
+                continue
+            is_east_african, country = self.extract_location_info(user.location)
+            if not is_east_african:
+                left_region.append(account['username'])
+                continue
+            # Accounts stay keyed by the username they were ranked under
+            refreshed.append(dict(
+                account,
+                user_id=str(user.id),
+                name=user.name,
+                location=user.location,
+                country=country,
+                followers_count=user.public_metrics['followers_count'],
+                following_count=user.public_metrics['following_count'],
+                tweet_count=user.public_metrics['tweet_count'],
+                verified=user.verified,
+                description=user.description
+            ))
+            
+        with self._stats_lock:
+            self.last_refresh_stats = {
+                'accounts': len(stored),
+                'refreshed': len(refreshed),
+                'not_found': missing,
+                'left_region': len(left_region),
+                'api_calls': self.api_calls['get_users'] - requests_before
+            }
+        print(f"Refreshed {len(refreshed)} of {len(stored)} saved accounts "
+              f"in {self.last_refresh_stats['api_calls']} user lookups ({missing} not found)")
+        if left_region:
+            self.results_store.remove(left_region)
+            print(f"Removed {len(left_region)} accounts that now list a location outside East Africa")
+        if not refreshed:
+            return pd.DataFrame()
+            
+        df = self.calculate_ai_rank(self.build_accounts_frame(refreshed))
+        self.results_store.upsert(df)  # Rows keep the topics they were found for
+        return df
+    
+    def _write_results(self, df: pd.DataFrame, name: str, csv: Optional[bool]) -> str:
+        """Write ranked rows to the Parquet dataset and/or a timestamped CSV; returns where they went."""
+        if csv is None:
+            csv = self.parquet_store is None
+        
+        path = None
+        if self.parquet_store is not None:
+            path = self.parquet_store.write(df, name=name)
+        if csv:
+            os.makedirs(self.results_dir, exist_ok=True)
+            path = os.path.join(self.results_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            df.to_csv(path, index=False)
+            self.results_store.mark_migrated(path)
+        return path
+    
+    @STAGE_SECONDS.time(stage='save')
+    def save_batch_results(self, rankings: Dict[str, pd.DataFrame], combined: pd.DataFrame,
+                           csv: Optional[bool] = None) -> str:
+        """Save a batch in one go: every per-topic ranking in one write and the combined leaderboard to the store."""
+        frames = [df.assign(topic=topic) for topic, df in rankings.items() if not df.empty]
+        if not frames:
             return None
             
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_filename = f"{topic.replace(' ', '_')}_{timestamp}"
+        path = self._write_results(pd.concat(frames, ignore_index=True), 'batch', csv)
+        self.results_store.upsert(combined)  # Rows keep the topics they were found for
         
-        os.makedirs('results', exist_ok=True)
-        csv_path = os.path.join('results', f"{base_filename}.csv")
+        return path
+    
+    @STAGE_SECONDS.time(stage='save')
+    def save_results(self, df: pd.DataFrame, topic: str, csv: Optional[bool] = None) -> str:
+        """Save results with enhanced metrics and upsert them into the results store.
         
-        # Prepare metrics for saving
-        df['engagement_score'] = df.apply(
-            lambda x: self.calculate_engagement_score(x['metrics']), axis=1
-        )
-        df['intensity_score'] = df.apply(
-            lambda x: self.calculate_intensity_score(x['annual_posts'], x['thread_count']), axis=1
-        )
+        Results go to the Parquet dataset when pyarrow is installed, and to a
+        CSV file when csv is True (the default without pyarrow). Returns the
+        CSV path if one was written, otherwise the dataset path.
+        """
+        if df.empty:
+            return None
+            
+        # Scores are normally already computed by calculate_ai_rank
+        if 'metrics' in df.columns:
+            df = self.build_accounts_frame(df.to_dict('records'))
+        df = self.add_scores(df).assign(topic=topic)
         
-        # Drop the raw metrics dictionary before saving
-        df = df.drop('metrics', axis=1)
-        df.to_csv(csv_path, index=False)
+        path = self._write_results(df, topic.replace(' ', '_'), csv)
+        self.results_store.upsert(df, topic=topic)
         
-        return csv_path
+        return path
+    
+    def export_results(self, path_or_buffer, columns: Optional[List[str]] = None, **filters):
+        """Export saved results as CSV on demand, filtered by country, category, topic or date."""
+        if self.parquet_store is None:
+            raise RuntimeError("Exporting saved results requires pyarrow (pip install pyarrow)")
+        return self.parquet_store.export_csv(path_or_buffer, columns=columns, **filters)
             
     def get_top_accounts(self, df: pd.DataFrame, parameter: str, n: int = 10) -> pd.DataFrame:
         """Get top N accounts with enhanced metrics."""
+        if not df.empty and 'annual_posts' in df.columns:
+            df = self.add_scores(df)
+            
         if df.empty or parameter not in df.columns:
             return None
             
@@ -258,5 +974,7 @@ class XAnalyzer:
             'username', 'name', 'location', 'country', parameter,
             'annual_posts', 'thread_count', 'category', 'verified'
         ]
+        if 'activity_days' in df.columns:
+            display_columns.append('activity_days')  # Marks lower-bound post counts
         
         return df.nlargest(n, parameter)[display_columns] 
\ No newline at end of file